@@ -7,8 +7,9 @@ from .core import (
     Subscriber,
     Transceiver,
     component_registry,
+    get_component_registry,
 )
-from .decorators import initial_state, register, register_multiple, state, transitions
+from .decorators import initial_state, register, register_multiple, state, subscribes, transitions
 from .state import StateMachine
 
 __all__ = [
@@ -20,10 +21,12 @@ __all__ = [
     'EventType',
     'register',
     'register_multiple',
+    'subscribes',
     'initial_state',
     'state',
     'transitions',
     'StateMachine',
     'ComponentRegistration',
-    'component_registry'
+    'component_registry',
+    'get_component_registry'
 ]
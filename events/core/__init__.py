@@ -1,7 +1,7 @@
 from .broker import Broker
 from .components import Publisher, Subscriber, Transceiver
 from .event import Event, EventType
-from .registry import ComponentRegistration, component_registry
+from .registry import ComponentRegistration, component_registry, get_component_registry
 
 __all__ = [
     'Publisher',
@@ -11,5 +11,6 @@ __all__ = [
     'EventType',
     'Broker',
     'component_registry',
+    'get_component_registry',
     'ComponentRegistration'
 ]
@@ -1,27 +1,144 @@
-from asyncio import CancelledError, Queue, Task, create_task, iscoroutinefunction, sleep
-from collections.abc import Callable
-from contextlib import suppress
+from asyncio import CancelledError, Task, create_task, gather, iscoroutinefunction, wait_for
+from asyncio import Event as AsyncioEvent
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from itertools import groupby
 from logging import getLogger
+from operator import attrgetter
 from typing import Any, Generic, TypeVar
+from weakref import WeakKeyDictionary
 
 from .components import Publisher, Subscriber, Transceiver
 from .event import Event, EventType
-from .registry import component_registry
+from .registry import get_component_registry
 
 T = TypeVar('T', bound=EventType)
 Component = Publisher | Subscriber | Transceiver
 
+# Per-class (name, category, is_publisher, is_subscriber), weak so dynamically created classes can be collected
+_CLASS_META: WeakKeyDictionary[type, tuple[str, str, bool, bool]] = WeakKeyDictionary()
+
+
+def _get_meta(cls: type) -> tuple[str, str, bool, bool]:
+    """Class name, category and pub/sub flags for a component class, computed once per class"""
+    meta = _CLASS_META.get(cls)
+    if meta is None:
+        is_publisher = issubclass(cls, Publisher)
+        is_subscriber = issubclass(cls, Subscriber)
+        if issubclass(cls, Transceiver):
+            category = "Transceiver"
+        elif is_publisher:
+            category = "Publisher"
+        elif is_subscriber:
+            category = "Subscriber"
+        else:
+            category = "Component"
+        meta = _CLASS_META[cls] = (cls.__name__, category, is_publisher, is_subscriber)
+    return meta
+
+
+class _EventQueue:
+    """Single-consumer FIFO, a deque plus one asyncio.Event that wakes the processor"""
+
+    __slots__ = ('_items', '_ready', 'maxsize')
+
+    def __init__(self, maxsize: int = 0):
+        self._items: deque[Event] = deque()
+        self._ready = AsyncioEvent()
+        self.maxsize = maxsize
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def qsize(self) -> int:
+        """Number of queued events"""
+        return len(self._items)
+
+    def full(self) -> bool:
+        """Whether the queue is at maxsize, a maxsize of 0 or less means unbounded"""
+        return 0 < self.maxsize <= len(self._items)
+
+    def put_nowait(self, event: Event) -> bool:
+        """Append an event and wake the processor, returns False if the queue is full"""
+        if self.full():
+            return False
+        self._items.append(event)
+        self._ready.set()
+        return True
+
+    async def drain(self) -> list[Event]:
+        """Take every queued event, waiting for one if the queue is empty"""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        batch = list(self._items)
+        self._items.clear()
+        return batch
+
+    def clear(self) -> int:
+        """Drop all queued events and return how many were dropped"""
+        dropped = len(self._items)
+        self._items.clear()
+        self._ready.clear()
+        return dropped
+
+
+@dataclass(slots=True)
+class ComponentSlot:
+    """A registered component plus the capability checks start/stop need, resolved once"""
+    component: Any
+    component_id: str
+    type_name: str
+    category: str
+    is_publisher: bool
+    is_subscriber: bool
+    is_state_machine: bool
+    has_run: bool
+    has_startup: bool
+    has_shutdown: bool
+    has_stop: bool
+
+    @classmethod
+    def for_component(cls, component: Any, component_id: str) -> 'ComponentSlot':
+        """Build a slot, running the isinstance/hasattr checks now instead of on every start/stop"""
+        type_name, category, is_publisher, is_subscriber = _get_meta(type(component))
+        return cls(
+            component=component,
+            component_id=component_id,
+            type_name=type_name,
+            category=category,
+            is_publisher=is_publisher,
+            is_subscriber=is_subscriber,
+            is_state_machine=hasattr(component, 'start') and hasattr(component, '_state_machine_running'),
+            # Subscribers, transceivers included, are driven by events and never get a run loop
+            has_run=not is_subscriber and callable(getattr(component, 'run', None)),
+            has_startup=hasattr(component, 'startup'),
+            has_shutdown=hasattr(component, 'shutdown'),
+            has_stop=hasattr(component, 'stop')
+        )
+
 
 class Broker(Generic[T]):
     """Event-driven pub/sub broker with auto-discovery"""
 
     def __init__(self, auto_discover: bool = True, max_queue_size: int = 500):
-        self._event_queue: Queue = Queue(maxsize=max_queue_size)
+        self._event_queue = _EventQueue(maxsize=max_queue_size)
+        # Set while nothing is queued or being dispatched
+        self._idle = AsyncioEvent()
+        self._idle.set()
         self._subscribers: dict[T, list[Callable]] = {}
-        self._components: dict[str, Component] = {}
+        # (sync, async) split of _subscribers per event type, built on first dispatch and dropped when they change
+        self._dispatch_tables: dict[T, tuple[tuple[Callable, ...], tuple[Callable, ...]]] = {}
+        self._components: dict[str, ComponentSlot] = {}
+        # Subset of _components that start() has to start as state machines
+        self._state_machine_slots: list[ComponentSlot] = []
         self._running = False
         self._event_processor_task: Task | None = None
         self._component_tasks: dict[str, Task] = {}
+        # Started components without a run loop, they get no task and are shut down directly in stop()
+        self._passive_components: dict[str, ComponentSlot] = {}
+        self._passive_startup_task: Task | None = None
         self._logger = getLogger(__name__)
         self._auto_discover = auto_discover
 
@@ -32,44 +149,78 @@ class Broker(Generic[T]):
 
         self._logger.info("Auto-discovering registered components...")
 
-        for _, registrations in component_registry.get_all_registrations().items():
-            for registration_info in registrations:
-                if registration_info['auto_start']:
-                    component = self._instantiate_component(registration_info)
-                    component_id = registration_info['component_id']
-                    self._register_component(component, component_id)
-                    self._logger.debug(f"Auto-registered {component_id}")
-
-    @staticmethod
-    def _instantiate_component(registration_info: dict) -> Any:
-        """Instantiate a component from registration info"""
-        cls = registration_info['class']
-        kwargs = registration_info['constructor_kwargs']
-        instance = cls(**kwargs)
-        return instance
+        # Bound once, the loop below runs per registration
+        register = self._register_component
+        debug = self._logger.debug
+        for registration_info in get_component_registry().get_auto_start_registrations():
+            component_id = registration_info['component_id']
+            register(registration_info['class_'](**registration_info['constructor_kwargs']), component_id)
+            debug("Auto-registered %s", component_id)
 
     def _register_component(self, component: Component, component_id: str) -> None:
         """Register a component and set up pub/sub connections"""
         if component_id in self._components:
             raise ValueError(f"Component ID '{component_id}' already registered")
-        self._components[component_id] = component
+        slot = self._components[component_id] = ComponentSlot.for_component(component, component_id)
+        if slot.is_state_machine:
+            self._state_machine_slots.append(slot)
         component._broker = self
         if hasattr(component, 'register_pending_subscriptions'):
             component.register_pending_subscriptions()
-        self._logger.debug(f"Registered component: {component_id}")
+        self._logger.debug("Registered component: %s", component_id)
 
     def register_component(self, component: Component, component_id: str) -> None:
         """Manually register a component"""
         if component_id is None:
-            component_id = component.__class__.__name__
+            component_id = _get_meta(type(component))[0]
         self._register_component(component, component_id)
 
     def subscribe(self, event_type: T, handler: Callable) -> None:
         """Subscribe a handler to an event type"""
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        self._subscribers[event_type].append(handler)
-        self._logger.debug(f"Subscribed handler to event type: {event_type}")
+        self._subscribers.setdefault(event_type, []).append(handler)
+        self._dispatch_tables.pop(event_type, None)
+        self._logger.debug("Subscribed handler to event type: %s", event_type)
+
+    def subscribe_many(self, event_types: Iterable[T], handler: Callable) -> None:
+        """Subscribe a handler to several event types in one call"""
+        subscribers = self._subscribers
+        dispatch_tables = self._dispatch_tables
+        for event_type in event_types:
+            subscribers.setdefault(event_type, []).append(handler)
+            dispatch_tables.pop(event_type, None)
+        self._logger.debug("Subscribed handler to event types: %s", event_types)
+
+    def _dispatch_table(self, event_type: T) -> tuple[tuple[Callable, ...], tuple[Callable, ...]]:
+        """Sync and async handlers of an event type, split once from _subscribers so dispatch never inspects them"""
+        table = self._dispatch_tables.get(event_type)
+        if table is None:
+            handlers = self._subscribers.get(event_type, ())
+            table = self._dispatch_tables[event_type] = (
+                tuple(handler for handler in handlers if not iscoroutinefunction(handler)),
+                tuple(handler for handler in handlers if iscoroutinefunction(handler))
+            )
+        return table
+
+    async def _dispatch(
+            self,
+            event: Event[T],
+            sync_handlers: Iterable[Callable],
+            async_handlers: Iterable[Callable]
+    ) -> None:
+        """Call sync handlers in order, then run the async ones concurrently"""
+        event_type = event.type
+        for handler in sync_handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                self._logger.error("Handler error for event %s: %s", event_type, e)
+
+        if not async_handlers:
+            return
+        results = await gather(*(handler(event) for handler in async_handlers), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self._logger.error("Handler error for event %s: %s", event_type, result)
 
     async def publish(self, event: Event[T]) -> None:
         """Publish an event to the queue"""
@@ -77,8 +228,11 @@ class Broker(Generic[T]):
             self._logger.warning("Cannot publish event, broker not running")
             return
 
-        await self._event_queue.put(event)
-        self._logger.debug(f"Published event: {event.type}")
+        if not self._event_queue.put_nowait(event):
+            self._logger.warning("Event queue full, dropping event: %s", event.type)
+            return
+        self._idle.clear()
+        self._logger.debug("Published event: %s", event.type)
 
     async def _process_events(self) -> None:
         """Main event processing loop"""
@@ -86,63 +240,79 @@ class Broker(Generic[T]):
 
         while self._running:
             try:
-                # Get event from queue
-                event = await self._event_queue.get()
-
-                # Find subscribers for this event type
-                if event.type in self._subscribers:
-                    handlers = self._subscribers[event.type]
-                    self._logger.debug(
-                        f"Processing event {event.type} with {len(handlers)} handlers"
-                    )
-
-                    # Call all handlers for this event type
-                    for handler in handlers:
-                        try:
-                            if iscoroutinefunction(handler):
-                                await handler(event)
-                            else:
-                                handler(event)
-                        except Exception as e:
-                            self._logger.error(f"Handler error for event {event.type}: {e}")
-                else:
-                    self._logger.debug(f"No subscribers for event type: {event.type}")
+                # Take everything queued since the last wakeup
+                batch = await self._event_queue.drain()
 
-                # Mark task as done
-                self._event_queue.task_done()
+                # Adjacent events of the same type share one handler lookup, publish order is kept
+                for event_type, events in groupby(batch, key=attrgetter('type')):
+                    handlers = self._subscribers.get(event_type)
+                    if not handlers:
+                        self._logger.debug("No subscribers for event type: %s", event_type)
+                        continue
+
+                    sync_handlers, async_handlers = self._dispatch_table(event_type)
+                    for event in events:
+                        self._logger.debug("Processing event %s with %s handlers", event_type, len(handlers))
+                        await self._dispatch(event, sync_handlers, async_handlers)
 
             except Exception as e:
-                self._logger.error(f"Event processing error: {e}")
+                self._logger.error("Event processing error: %s", e)
+
+            if not self._event_queue:
+                self._idle.set()
 
-    async def _run_component(self, component: Component, component_id: str) -> None:
-        """Run a component's main loop if it has one"""
+    async def wait_idle(self, timeout: float | None = 2.0) -> None:
+        """Wait until every published event has been dispatched, raises TimeoutError after timeout seconds"""
+        await wait_for(self._idle.wait(), timeout)
+
+    async def _startup(self, slot: ComponentSlot) -> None:
+        """Run a component's startup hook, failures are logged and re-raised"""
         try:
-            try:
-                await component.startup()
-                self._logger.debug(f"Started up component: {component_id}")
-            except Exception as e:
-                self._logger.error(f"Startup failed for {component_id}: {e}")
-                raise
+            if slot.has_startup:
+                await slot.component.startup()
+            self._logger.debug("Started up component: %s", slot.component_id)
+        except Exception as e:
+            self._logger.error("Startup failed for %s: %s", slot.component_id, e)
+            raise
 
-            if not isinstance(component, Subscriber) and hasattr(component, 'run') and callable(component.run):
-                self._logger.info(f"Starting component run loop: {component_id}")
-                await component.run()
-            else:
-                # Component doesn't have a run method, just keep it alive
-                self._logger.debug(f"Component {component_id} has no run method, keeping alive...")
-                while self._running:
-                    await sleep(1)
+    async def _shutdown(self, slot: ComponentSlot) -> None:
+        """Run a component's shutdown hook, failures are logged"""
+        try:
+            if slot.has_shutdown:
+                await slot.component.shutdown()
+            self._logger.debug("Shut down component: %s", slot.component_id)
+        except Exception as e:
+            self._logger.error("Error during %s shutdown: %s", slot.component_id, e)
+
+    async def _run_component(self, slot: ComponentSlot, component_id: str) -> None:
+        """Run a component's main loop"""
+        try:
+            await self._startup(slot)
+            self._logger.info("Starting component run loop: %s", component_id)
+            await slot.component.run()
         except CancelledError:
-            self._logger.info(f"Component {component_id} cancelled")
+            self._logger.info("Component %s cancelled", component_id)
             raise
         except Exception as e:
-            self._logger.error(f"Component {component_id} crashed: {e}")
+            self._logger.error("Component %s crashed: %s", component_id, e)
         finally:
-            try:
-                await component.shutdown()
-                self._logger.debug(f"Shut down component: {component_id}")
-            except Exception as e:
-                self._logger.error(f"Error during {component_id} shutdown: {e}")
+            await self._shutdown(slot)
+
+    async def _start_passive(self, slot: ComponentSlot) -> None:
+        """Start up a component without a run loop, it only needs its startup hook"""
+        try:
+            await self._startup(slot)
+        except BaseException:
+            # Failed or cancelled, shut down like a run-loop component would, a half-finished startup may hold resources
+            await self._shutdown(slot)
+            raise
+        # Recorded as soon as it's up, so stop() shuts it down even if the other startups are cancelled
+        self._passive_components[slot.component_id] = slot
+
+    async def _start_passive_components(self, slots: list[ComponentSlot]) -> None:
+        """Start up the components without a run loop together, stop() shuts down the ones that started"""
+        # Failures are already logged by _startup, one of them mustn't cut the others short
+        await gather(*(self._start_passive(slot) for slot in slots), return_exceptions=True)
 
     async def start(self) -> None:
         """Start the broker and all components"""
@@ -157,24 +327,39 @@ class Broker(Generic[T]):
 
         self._event_processor_task = create_task(self._process_events())
 
-        # Start all components that need running
-        for component_id, component in self._components.items():
-            task = create_task(self._run_component(component, component_id))
-            self._component_tasks[component_id] = task
+        # Start all components that need running, the rest only need their startup hook
+        passive = []
+        for component_id, slot in self._components.items():
+            if slot.has_run:
+                task = create_task(self._run_component(slot, component_id))
+                self._component_tasks[component_id] = task
+            else:
+                passive.append(slot)
+        if passive:
+            # In the background, a slow startup hook mustn't hold up start() or the other components
+            self._passive_startup_task = create_task(self._start_passive_components(passive))
 
         # Start state machines for components that have them
-        for component_id, component in self._components.items():
-            if hasattr(component, 'start') and hasattr(component, '_state_machine_running'):
-                try:
-                    started = await component.start()
-                    if started:
-                        self._logger.info(f"Started state machine for {component_id}")
-                    else:
-                        self._logger.warning(f"Failed to start state machine for {component_id}")
-                except Exception as e:
-                    self._logger.error(f"Error starting state machine for {component_id}: {e}")
-
-        self._logger.info(f"Broker started with {len(self._components)} components")
+        for slot in self._state_machine_slots:
+            component_id = slot.component_id
+            try:
+                started = await slot.component.start()
+                if started:
+                    self._logger.info("Started state machine for %s", component_id)
+                else:
+                    self._logger.warning("Failed to start state machine for %s", component_id)
+            except Exception as e:
+                self._logger.error("Error starting state machine for %s: %s", component_id, e)
+
+        self._logger.info("Broker started with %s components", len(self._components))
+
+    async def _stop_component(self, slot: ComponentSlot) -> None:
+        """Stop a component's state machine, failures are logged"""
+        try:
+            await slot.component.stop()
+            self._logger.info("Stopped state machine for %s", slot.component_id)
+        except Exception as e:
+            self._logger.error("Error stopping state machine for %s: %s", slot.component_id, e)
 
     async def stop(self) -> None:
         """Stop the broker and all components"""
@@ -185,34 +370,45 @@ class Broker(Generic[T]):
         self._running = False
 
         # Stop state machines for components that have them
-        for component_id, component in self._components.items():
-            if hasattr(component, 'stop'):
-                try:
-                    await component.stop()
-                    self._logger.info(f"Stopped state machine for {component_id}")
-                except Exception as e:
-                    self._logger.error(f"Error stopping state machine for {component_id}: {e}")
-
-        # Stop all component tasks
-        for component_id, task in self._component_tasks.items():
-            self._logger.debug(f"Stopping component: {component_id}")
+        await gather(*(self._stop_component(slot) for slot in self._components.values() if slot.has_stop))
+
+        # Cancel every component task and the event processor, then wait for all of them in one go
+        tasks = []
+        component_tasks = self._component_tasks
+        while component_tasks:
+            component_id, task = component_tasks.popitem()
+            self._logger.debug("Stopping component: %s", component_id)
             task.cancel()
-            with suppress(CancelledError):
-                await task
-
-        self._component_tasks.clear()
-
-        # Stop event processor
+            tasks.append(task)
+        if self._passive_startup_task:
+            self._passive_startup_task.cancel()
+            tasks.append(self._passive_startup_task)
+            self._passive_startup_task = None
         if self._event_processor_task:
             self._event_processor_task.cancel()
-            with suppress(CancelledError):
-                await self._event_processor_task
-
-        # Wait for any remaining events to be processed
-        await self._event_queue.join()
-
+            tasks.append(self._event_processor_task)
+        await gather(*tasks, return_exceptions=True)
+
+        # Components without a run loop have no task to cancel, shut them down directly
+        passive = []
+        while self._passive_components:
+            passive.append(self._shutdown(self._passive_components.popitem()[1]))
+        await gather(*passive)
+
+        # The processor is gone, so anything still queued will never be handled
+        dropped = self._event_queue.clear()
+        if dropped:
+            self._logger.warning("Dropped %s unprocessed events on stop", dropped)
+        self._idle.set()
+
+        # Their subscriptions are cleared below, a subscriber registered again must resubscribe its @subscribes handlers
+        for slot in self._components.values():
+            if slot.is_subscriber:
+                slot.component._class_subscriptions_broker = None
         self._components.clear()
+        self._state_machine_slots.clear()
         self._subscribers.clear()
+        self._dispatch_tables.clear()
 
         self._logger.info("Broker stopped")
 
@@ -222,14 +418,16 @@ class Broker(Generic[T]):
         if component_id not in self._components:
             return None
 
-        component = self._components[component_id]
+        slot = self._components[component_id]
         return {
             "id": component_id,
-            "class": component.__class__.__name__,
-            "type": "Publisher" if isinstance(component, Publisher) else "Subscriber",
+            "class": slot.type_name,
+            "type": slot.category,
             "running": (
-                component_id in self._component_tasks and
-                not self._component_tasks[component_id].done()
+                component_id in self._passive_components or (
+                    component_id in self._component_tasks and
+                    not self._component_tasks[component_id].done()
+                )
             )
         }
 
@@ -239,11 +437,11 @@ class Broker(Generic[T]):
 
     def list_event_types(self) -> list[T]:
         """List all subscribed event types"""
-        return list(self._subscribers.keys())
+        return list(self._subscribers)
 
     def get_subscriber_count(self, event_type: T) -> int:
         """Get number of subscribers for an event type"""
-        return len(self._subscribers.get(event_type, []))
+        return len(self._subscribers.get(event_type, ()))
 
     @property
     def is_running(self) -> bool:
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, Generic, Optional, TypeVar
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
 
 from ..event import Event, EventType
 from ._base import Base
@@ -13,28 +14,72 @@ T = TypeVar('T', bound=EventType)
 class Subscriber(Base, Generic[T]):
     """Base class for anything that subscribes to events"""
 
+    # (method name, event types) pairs declared with @subscribes, collected once per class
+    _class_subscriptions: tuple[tuple[str, tuple[Any, ...]], ...] = ()
+
+    # Cached bound handle_event, left unset on state machines
+    _handle_event_bound: Callable | None = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        subscriptions = dict(cls._class_subscriptions)
+        for name, attr in vars(cls).items():
+            event_types = getattr(attr, '_event_types', None)
+            if event_types is not None:
+                subscriptions[name] = event_types
+        cls._class_subscriptions = tuple(subscriptions.items())
+
     def __init__(self, broker: Optional["Broker"] = None):
         super().__init__(broker)
         self._pending_subscriptions: list[T] = []
+        # Broker the @subscribes handlers were last subscribed on, so re-registering doesn't subscribe them twice
+        self._class_subscriptions_broker: Broker | None = None
+        # Bound once so every subscription hands the broker the same handler object. State machines skip the
+        # cache, a bound method stored on the instance would keep it alive in a reference cycle
+        if not getattr(type(self).handle_event, '_state_aware', False):
+            self._handle_event_bound = self.handle_event
+
+    @property
+    def _event_handler(self) -> Callable:
+        """Bound handle_event that subscriptions hand the broker"""
+        return self._handle_event_bound or self.handle_event
 
     def subscribe_to(self, event_type: T) -> None:
         """Subscribe to an event type"""
         if self._broker:
-            self._broker.subscribe(event_type, self.handle_event)
+            self._broker.subscribe(event_type, self._event_handler)
             self._logger.debug(f"Subscribed to {event_type}")
         else:
             # Broker not assigned yet, store for later
             self._pending_subscriptions.append(event_type)
 
     def register_pending_subscriptions(self) -> None:
-        """Register subscriptions that were made before broker was attached"""
-        if not self._broker:
+        """Register @subscribes handlers and subscriptions that were made before broker was attached"""
+        broker = self._broker
+        if not broker:
             return
 
-        for event_type in self._pending_subscriptions:
-            self._broker.subscribe(event_type, self.handle_event)
-            self._logger.debug(f"Registered pending subscription to {event_type}")
-        self._pending_subscriptions.clear()
+        if self._class_subscriptions_broker is not broker:
+            self._class_subscriptions_broker = broker
+            for name, event_types in self._class_subscriptions:
+                handler = self._event_handler if name == 'handle_event' else getattr(self, name)
+                self._subscribe_all(broker, event_types, handler)
+
+        if not self._pending_subscriptions:
+            return
+
+        pending, self._pending_subscriptions = self._pending_subscriptions, []
+        self._subscribe_all(broker, pending, self._event_handler)
+        self._logger.debug(f"Registered pending subscriptions to {pending}")
+
+    @staticmethod
+    def _subscribe_all(broker: "Broker", event_types: Iterable[T], handler: Callable) -> None:
+        """Subscribe a handler in one broker call when the broker supports it"""
+        if hasattr(broker, 'subscribe_many'):
+            broker.subscribe_many(event_types, handler)
+        else:
+            for event_type in event_types:
+                broker.subscribe(event_type, handler)
 
     async def handle_event(self, event: Event[T]) -> None:
         """Handle received events, override this"""
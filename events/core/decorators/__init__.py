@@ -1,7 +1,9 @@
 from .multiple import register_multiple
 from .single import register
+from .subscribes import subscribes
 
 __all__ = [
     'register',
     'register_multiple',
+    'subscribes',
 ]
\ No newline at end of file
@@ -1,6 +1,6 @@
 from typing import Any
 
-from ..registry import ComponentRegistration, component_registry
+from ..registry import ComponentRegistration, get_component_registry
 
 
 def _register_single_instance(
@@ -11,7 +11,7 @@ def _register_single_instance(
         index: int = -1,
         id_: str | None = None
 ) -> None:
-    component_registry.add_registration(
+    get_component_registry().add_registration(
         component_type,
         ComponentRegistration(**{
             'class': class_,
@@ -2,16 +2,21 @@ from typing import Any
 
 from ..components import Publisher, Subscriber, Transceiver
 
+# Transceiver subclasses hit Transceiver before Publisher/Subscriber in their MRO
+_TYPE_MAP: dict[type, str] = {
+    Transceiver: 'transceivers',
+    Publisher: 'publishers',
+    Subscriber: 'subscribers',
+}
+
 
 def determine_component_type(class_: Any) -> str:
-    if issubclass(class_, Transceiver):
-        component_type = 'transceivers'
-    elif issubclass(class_, Publisher):
-        component_type = 'publishers'
-    elif issubclass(class_, Subscriber):
-        component_type = 'subscribers'
-    else:
-        raise ValueError(
-            f"Class {class_.__name__} must inherit from Publisher, Subscriber, or Transceiver"
-        )
-    return component_type
+    if not isinstance(class_, type):
+        raise TypeError(f"Expected a class, got {class_!r}")
+    for base in class_.__mro__:
+        component_type = _TYPE_MAP.get(base)
+        if component_type is not None:
+            return component_type
+    raise ValueError(
+        f"Class {class_.__name__} must inherit from Publisher, Subscriber, or Transceiver"
+    )
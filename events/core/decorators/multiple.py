@@ -33,6 +33,5 @@ def register_multiple(
         component_type = determine_component_type(cls)
         for i, instance_kwargs in enumerate(instances):
             _register_single_instance(cls, instance_kwargs, auto_start, component_type, i, id_)
-        cls._auto_start = auto_start
         return cls
     return decorator
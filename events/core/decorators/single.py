@@ -25,7 +25,6 @@ def register(
     def decorator(cls: type[T]) -> type[T]:
         component_type = determine_component_type(cls)
         _register_single_instance(cls, constructor_kwargs, auto_start, component_type)
-        cls._auto_start = auto_start
         return cls
 
     if len(args) == 1 and inspect.isclass(args[0]) and not constructor_kwargs:
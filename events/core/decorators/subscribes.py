@@ -0,0 +1,25 @@
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from ..event import EventType
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+def subscribes(*event_types: EventType) -> Callable[[F], F]:
+    """
+    Decorator to subscribe a Subscriber method to event types when the component is registered
+
+    Usage:
+        class MyLogger(Subscriber):
+            @subscribes(MyEvents.READING, MyEvents.ALERT)
+            async def handle_event(self, event): ...
+    """
+    if not event_types:
+        raise ValueError("subscribes() needs at least one event type")
+
+    def decorator(func: F) -> F:
+        func._event_types = (*getattr(func, '_event_types', ()), *event_types)
+        return func
+
+    return decorator
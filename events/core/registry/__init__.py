@@ -1,47 +1,138 @@
+from collections.abc import Mapping
+from contextvars import ContextVar
+from types import MappingProxyType
 from typing import Any
 
-from pydantic import BaseModel, Field
-
 from .registration import ComponentRegistration
 
+_COMPONENT_TYPES = ('publishers', 'subscribers', 'transceivers')
+_FIELDS = ('class_', 'component_id', 'constructor_kwargs', 'auto_start')
+
+
+def _frozen_row(row: dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only registration row, constructor_kwargs copied so the cached views never share the stored dict"""
+    row['constructor_kwargs'] = MappingProxyType(dict(row['constructor_kwargs']))
+    return MappingProxyType(row)
 
-class ComponentRegistry(BaseModel):
-    publishers: list[ComponentRegistration] = Field(default_factory=list, description="Registered publishers")
-    subscribers: list[ComponentRegistration] = Field(default_factory=list, description="Registered subscribers")
-    transceivers: list[ComponentRegistration] = Field(default_factory=list, description="Registered transceivers")
 
-    def get_all_registrations(self) -> dict[str, list[dict[str, Any]]]:
-        return {
-            'publishers': [reg.model_dump() for reg in self.publishers],
-            'subscribers': [reg.model_dump() for reg in self.subscribers],
-            'transceivers': [reg.model_dump() for reg in self.transceivers]
+class ComponentRegistry:
+    """Registrations stored column-wise, one list per field for each component type"""
+
+    def __init__(self) -> None:
+        self._by_type: dict[str, dict[str, list[Any]]] = {
+            component_type: {name: [] for name in _FIELDS} for component_type in _COMPONENT_TYPES
         }
+        self._count = 0
+        self._all_registrations: Mapping[str, tuple[Mapping[str, Any], ...]] | None = None
+        self._auto_start_registrations: tuple[Mapping[str, Any], ...] | None = None
+        self._row_views: dict[str, tuple[ComponentRegistration, ...]] = {}
+
+    def _rows(self, component_type: str) -> tuple[ComponentRegistration, ...]:
+        """Registrations of one type rebuilt from the columns, a tuple so appending to it fails instead of being lost"""
+        rows = self._row_views.get(component_type)
+        if rows is None:
+            columns = self._by_type[component_type]
+            rows = self._row_views[component_type] = tuple(
+                ComponentRegistration(**{
+                    'class': class_,
+                    'component_id': component_id,
+                    'constructor_kwargs': constructor_kwargs,
+                    'auto_start': auto_start
+                })
+                for class_, component_id, constructor_kwargs, auto_start in zip(*columns.values(), strict=True)
+            )
+        return rows
+
+    @property
+    def publishers(self) -> tuple[ComponentRegistration, ...]:
+        """Registered publishers, use add_registration() to add one"""
+        return self._rows('publishers')
+
+    @property
+    def subscribers(self) -> tuple[ComponentRegistration, ...]:
+        """Registered subscribers, use add_registration() to add one"""
+        return self._rows('subscribers')
+
+    @property
+    def transceivers(self) -> tuple[ComponentRegistration, ...]:
+        """Registered transceivers, use add_registration() to add one"""
+        return self._rows('transceivers')
+
+    def get_all_registrations(self) -> Mapping[str, tuple[Mapping[str, Any], ...]]:
+        """Read-only view of all registrations, all the way down, cached until the next add or clear"""
+        if self._all_registrations is None:
+            self._all_registrations = MappingProxyType({
+                component_type: tuple(
+                    _frozen_row(dict(zip(_FIELDS, row, strict=True))) for row in zip(*columns.values(), strict=True)
+                )
+                for component_type, columns in self._by_type.items()
+            })
+        return self._all_registrations
+
+    def get_auto_start_registrations(self) -> tuple[Mapping[str, Any], ...]:
+        """Registrations flagged auto_start, in publishers, subscribers, transceivers order, cached like above"""
+        if self._auto_start_registrations is not None:
+            return self._auto_start_registrations
+
+        result = []
+        for columns in self._by_type.values():
+            classes = columns['class_']
+            component_ids = columns['component_id']
+            constructor_kwargs = columns['constructor_kwargs']
+            for i, auto_start in enumerate(columns['auto_start']):
+                if auto_start:
+                    result.append(_frozen_row({
+                        'class_': classes[i],
+                        'component_id': component_ids[i],
+                        'constructor_kwargs': constructor_kwargs[i]
+                    }))
+        self._auto_start_registrations = tuple(result)
+        return self._auto_start_registrations
 
     def add_registration(self, component_type: str, registration_: ComponentRegistration) -> None:
-        """Add a registration to the appropriate list"""
-        if component_type == 'publishers':
-            self.publishers.append(registration_)
-        elif component_type == 'subscribers':
-            self.subscribers.append(registration_)
-        elif component_type == 'transceivers':
-            self.transceivers.append(registration_)
-        else:
+        """Add a registration to the appropriate columns"""
+        columns = self._by_type.get(component_type)
+        if columns is None:
             raise ValueError(f"Unknown component type: {component_type}")
+        columns['class_'].append(registration_.class_)
+        columns['component_id'].append(registration_.component_id)
+        columns['constructor_kwargs'].append(registration_.constructor_kwargs)
+        columns['auto_start'].append(registration_.auto_start)
+        self._count += 1
+        self._invalidate_caches()
 
     def clear(self) -> None:
         """Clear all registrations"""
-        self.publishers.clear()
-        self.subscribers.clear()
-        self.transceivers.clear()
+        for columns in self._by_type.values():
+            for column in columns.values():
+                column.clear()
+        self._count = 0
+        self._invalidate_caches()
+
+    def _invalidate_caches(self) -> None:
+        """Drop the cached registration views, called after every mutation"""
+        self._all_registrations = None
+        self._auto_start_registrations = None
+        self._row_views.clear()
 
     @property
     def total_count(self) -> int:
         """Total number of registered components"""
-        return len(self.publishers) + len(self.subscribers) + len(self.transceivers)
+        return self._count
 
 component_registry = ComponentRegistry()
 
+# Registry the decorators and brokers use in the current context, defaults to the global one
+_registry_var: ContextVar[ComponentRegistry] = ContextVar('component_registry', default=component_registry)
+
+
+def get_component_registry() -> ComponentRegistry:
+    """Registry active in the current context"""
+    return _registry_var.get()
+
+
 __all__ = [
     'component_registry',
+    'get_component_registry',
     'ComponentRegistration'
 ]
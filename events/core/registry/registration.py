@@ -1,11 +1,40 @@
+from dataclasses import dataclass, field
 from typing import Any
 
-from pydantic import BaseModel, Field
 
-
-class ComponentRegistration(BaseModel):
+@dataclass(slots=True, frozen=True, init=False)
+class ComponentRegistration:
     """Registration information for a component"""
-    class_: type = Field(..., alias="class", description="Component class")
-    constructor_kwargs: dict[str, Any] = Field(default_factory=dict, description="Constructor arguments")
-    auto_start: bool = Field(default=True, description="Whether to auto-start this component")
-    component_id: str = Field(..., description="Unique identifier for the component")
+    class_: type
+    component_id: str
+    constructor_kwargs: dict[str, Any] = field(default_factory=dict)
+    auto_start: bool = True
+
+    def __init__(
+            self,
+            *,
+            component_id: str,
+            constructor_kwargs: dict[str, Any] | None = None,
+            auto_start: bool = True,
+            **class_: type
+    ) -> None:
+        """The component class is passed as ``class`` (or ``class_``), e.g. ``**{"class": MyPublisher, ...}``"""
+        if len(class_) != 1 or not class_.keys() <= {'class', 'class_'}:
+            raise TypeError(f"Expected exactly one of 'class' or 'class_', got {sorted(class_)}")
+        object.__setattr__(self, 'class_', next(iter(class_.values())))
+        object.__setattr__(self, 'component_id', component_id)
+        object.__setattr__(self, 'constructor_kwargs', {} if constructor_kwargs is None else constructor_kwargs)
+        object.__setattr__(self, 'auto_start', auto_start)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Dict of the fields, keyed like the dataclass fields"""
+        return {
+            'class_': self.class_,
+            'constructor_kwargs': dict(self.constructor_kwargs),
+            'auto_start': self.auto_start,
+            'component_id': self.component_id
+        }
+
+    def model_dump(self) -> dict[str, Any]:
+        """Alias of to_dict(), kept from when this was a pydantic model"""
+        return self.to_dict()
@@ -1,9 +1,10 @@
-from ..core.decorators import register, register_multiple
+from ..core.decorators import register, register_multiple, subscribes
 from ..state.decorators import initial_state, state, transitions
 
 __all__ = [
     "register",
     "register_multiple",
+    "subscribes",
     "initial_state",
     "transitions",
     "state"
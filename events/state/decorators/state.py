@@ -1,31 +1,60 @@
 from asyncio import sleep
 from collections.abc import Awaitable, Callable
-from functools import wraps
+from inspect import Parameter, signature
 from typing import Any, TypeVar
 
 P = TypeVar('P')
 T = TypeVar('T')
 
+_POSITIONAL = (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD, Parameter.VAR_POSITIONAL)
+
+
+def accepts_event(func: Callable[..., Any], skip: int = 0) -> bool:
+    """Whether func takes the event as a positional argument after its first skip parameters"""
+    try:
+        parameters = list(signature(func).parameters.values())[skip:]
+    except (TypeError, ValueError):
+        return True  # No signature to read, pass the event like before
+    return any(parameter.kind in _POSITIONAL for parameter in parameters)
+
+
+def accepts_events(func: Callable[..., Any]) -> bool:
+    """Whether func takes an events keyword, the batch of every event received since its last call"""
+    try:
+        parameter = signature(func).parameters.get('events')
+    except (TypeError, ValueError):
+        return False
+    return parameter is not None and parameter.kind is not Parameter.POSITIONAL_ONLY
+
+
 def state(
         state_name: str, poll_interval: float = 0.1
 ) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
     """State decorator with polling support."""
+    # Built once here instead of formatting the attribute name on every tick
+    override_attr = f'_{state_name}_poll_interval'
+
     def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
-        @wraps(func)
         async def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
             # Call the original state method
             result = await func(self, *args, **kwargs)
 
             # If state doesn't return a transition, poll at configured interval
             if result is None or result == self._current_state:
-                current_interval = getattr(self, f'_{state_name}_poll_interval', poll_interval)
+                current_interval = getattr(self, override_attr, poll_interval)
                 await sleep(current_interval)
 
             return result
 
+        # Only the names are kept for reprs and tracebacks, the state machine reads the markers below
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
         wrapper._is_state = True
         wrapper._state_name = state_name
         wrapper._default_poll_interval = poll_interval
+        # Read once here so the state loop never inspects handlers, skips self
+        wrapper._accepts_event = accepts_event(func, skip=1)
+        wrapper._accepts_events = accepts_events(func)
         return wrapper
 
     return decorator
\ No newline at end of file
@@ -1,11 +1,31 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping
+from types import MappingProxyType
 from typing import TypeVar
 
 T = TypeVar('T')
 
+# (transition map it was built from, state name -> bit index, allowed-target bitmask per state index)
+CompiledTransitions = tuple[Mapping[str, Iterable[str]], dict[str, int], tuple[int, ...]]
+
+
+def compile_transitions(transition_map: Mapping[str, Iterable[str]]) -> CompiledTransitions:
+    """Number every state in the map and fold each state's allowed targets into an int bitmask"""
+    states = sorted({*transition_map, *(target for targets in transition_map.values() for target in targets)})
+    state_ids = {state_name: i for i, state_name in enumerate(states)}
+    masks = [0] * len(states)
+    for state_name, targets in transition_map.items():
+        for target in targets:
+            masks[state_ids[state_name]] |= 1 << state_ids[target]
+    return transition_map, state_ids, tuple(masks)
+
+
 def transitions(transition_map: dict[str, list[str]]) -> Callable[..., Callable[..., T]]:
     """Decorator to define valid state transitions"""
     def decorator(cls: type[T]) -> type[T]:
-        cls._transition_map = {state: set(transitions_) for state, transitions_ in transition_map.items()}
+        # Read-only so the compiled masks can never go stale
+        cls._transition_map = MappingProxyType(
+            {state: frozenset(transitions_) for state, transitions_ in transition_map.items()}
+        )
+        cls._compiled_transitions = compile_transitions(cls._transition_map)
         return cls
     return decorator
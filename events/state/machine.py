@@ -1,14 +1,36 @@
 import time
-from asyncio import CancelledError, Task, create_task
-from collections.abc import Callable
+from asyncio import AbstractEventLoop, CancelledError, Runner, Task, create_task
+from collections import deque
+from collections.abc import Callable, Coroutine, Mapping
+from collections.abc import Set as AbstractSet
 from contextlib import suppress
+from functools import wraps
 from logging import getLogger
-from typing import Generic, TypeVar
+from types import MethodType
+from typing import Any, ClassVar, Generic, TypeVar
+from weakref import WeakSet
 
 from ..core.event import Event, EventType
+from .decorators.state import accepts_event, accepts_events
+from .decorators.transitions import CompiledTransitions
 
 T = TypeVar('T', bound=EventType)
 
+# How the run loop hands pending events to a state handler
+_NO_EVENT, _LATEST_EVENT, _EVENT_BATCH = 0, 1, 2
+
+
+def _state_aware(handle_event: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a class's handle_event so the received event is also made available to the current state"""
+    @wraps(handle_event)  # also carries over @subscribes event types
+    async def wrapper(self: 'StateMachine', event: Event) -> None:
+        # Only the outermost wrapper queues the event, the ones reached through super().handle_event() don't
+        if type(self).handle_event is wrapper:
+            self._pending_events.append(event)
+        await handle_event(self, event)
+    wrapper._state_aware = True
+    return wrapper
+
 
 class StateMachine(Generic[T]):
     """
@@ -16,65 +38,142 @@ class StateMachine(Generic[T]):
     and transitioning to new states based on return values
     """
 
-    _transition_map: dict[str, set[str]]
+    _transition_map: Mapping[str, AbstractSet[str]]
+    # Bitmasks @transitions compiled from its read-only map, None without the decorator
+    _compiled_transitions: ClassVar[CompiledTransitions | None] = None
     _initial_state: str | None
     _state_handlers: dict[str, Callable]
 
-    def __init__(self, state_change_event_type: T | None = None, max_consecutive_errors: int = 5):
-        # Core state tracking
-        self._current_state: str | None = None
-        self._previous_state: str | None = None
-        self._state_start_time: float = 0
-
+    # State name -> plain @state function, collected once per class, bound to the instance only while running
+    _state_funcs: ClassVar[dict[str, Callable]] = {}
+
+    # Unwrapped handle_event of the most derived class that defines one
+    _original_handle_event: Callable[..., Any]
+
+    # Every unfinished task any state machine spawned, weak so finished tasks drop out on their own
+    _live_tasks: ClassVar[WeakSet[Task]] = WeakSet()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # If this is a subscriber, intercept events for state machine, once per class that defines handle_event
+        handle_event = getattr(cls, 'handle_event', None)
+        if handle_event is not None and not hasattr(handle_event, '_state_aware'):
+            cls._original_handle_event = handle_event
+            cls.handle_event = _state_aware(handle_event)
+
+        state_funcs: dict[str, Callable] = {}
+        for attr_name in dir(cls):
+            attr = getattr(cls, attr_name, None)
+            if attr is not None and hasattr(attr, '_is_state'):
+                state_funcs[attr._state_name] = attr
+        cls._state_funcs = state_funcs
+
+    def __init__(
+            self,
+            state_change_event_type: T | None = None,
+            max_consecutive_errors: int = 5,
+            *,
+            loop_factory: Callable[[], AbstractEventLoop] | None = None,
+            max_pending_events: int = 100
+    ):
         # State configuration from decorators
         self._state_handlers: dict[str, Callable] = {}
-        self._transition_map: dict[str, set[str]] = getattr(self.__class__, '_transition_map', {})
+        # Handlers numbered by state id, so the run loop indexes a list instead of hashing the state name
+        self._handlers_by_id: list[Callable] = []
+        self._event_modes_by_id: list[int] = []
+        # (handler dict it was built from, its state names), rebuilt if _state_handlers is replaced or resized
+        self._available_states: tuple[dict[str, Callable], frozenset[str]] = (self._state_handlers, frozenset())
+        self._handler_ids: dict[str, int] = {}
+
+        # Core state tracking, _current_state_id indexes _handlers_by_id
+        self._current_state_name: str | None = None
+        self._current_state_id: int | None = None
+        self._previous_state: str | None = None
+        self._state_start_time_ns = 0
+        self._transition_map: Mapping[str, AbstractSet[str]] = getattr(self.__class__, '_transition_map', {})
         self._initial_state: str = getattr(self.__class__, '_initial_state', None)
 
         # Runtime control
         self._state_machine_running = False
         self._state_task: Task | None = None
-        self._current_event: Event[T] | None = None
+        # Events received since a state last took them, oldest dropped first past max_pending_events (0 is unbounded)
+        self._pending_events: deque[Event[T]] = deque(maxlen=max_pending_events if max_pending_events > 0 else None)
 
         self._logger = getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
 
         # Auto-discover state methods
         self._discover_states()
-
-        # If this is a subscriber, intercept events for state machine
-        if hasattr(self, 'handle_event'):
-            self._original_handle_event = self.handle_event  # type: ignore[has-type]
-            self.handle_event = self._state_aware_handle_event
+        self._index_state_handlers()
 
         self._consecutive_errors = 0
         self._max_consecutive_errors = max_consecutive_errors
         self._state_change_event_type = state_change_event_type
+        # Loop run_standalone() creates, e.g. uvloop.new_event_loop, None for asyncio's default
+        self._loop_factory = loop_factory
+
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> Task:
+        """Create a task owned by this state machine, the caller keeps the strong reference"""
+        task = create_task(coro)
+        StateMachine._live_tasks.add(task)
+        return task
+
+    @staticmethod
+    def _all_owned_tasks() -> list[Task]:
+        """Unfinished tasks spawned by any state machine"""
+        return [task for task in StateMachine._live_tasks if not task.done()]
 
     def _discover_states(self) -> None:
         """Find methods decorated with @state"""
-        for attr_name in dir(self):
-            attr = getattr(self, attr_name)
-            if hasattr(attr, '_is_state'):
-                state_name = attr._state_name
-                self._state_handlers[state_name] = attr
-                self._logger.debug(f"Discovered state: {state_name}")
-
-    async def _state_aware_handle_event(self, event: Event[T]) -> None:
-        """Intercept events and make them available to current state"""
-        # Store current event for state methods to access
-        self._current_event = event
-
-        # Also call original handler if it exists
-        if hasattr(self, '_original_handle_event'):
-            await self._original_handle_event(event)
+        # Plain functions, storing bound methods here would tie self into a reference cycle
+        for state_name, func in type(self)._state_funcs.items():
+            self._state_handlers[state_name] = func
+            self._logger.debug("Discovered state: %s", state_name)
+
+    def _bind_handler(self, state_name: str, handler: Callable) -> Callable:
+        """Bind a discovered @state function to this instance, anything else is already callable as is"""
+        if type(self)._state_funcs.get(state_name) is handler:
+            return MethodType(handler, self)
+        return handler
+
+    def _index_state_handlers(self) -> None:
+        """Number the state handlers for the run loop, the current state keeps its name and gets its new id"""
+        self._handler_ids = {state_name: i for i, state_name in enumerate(self._state_handlers)}
+        self._handlers_by_id = list(self._state_handlers.values())
+        self._event_modes_by_id = [self._event_mode(handler) for handler in self._handlers_by_id]
+        self._available_states = (self._state_handlers, frozenset(self._state_handlers))
+        self._current_state = self._current_state_name
+
+    @staticmethod
+    def _event_mode(handler: Callable) -> int:
+        """How the run loop passes pending events to handler, @state precomputes it, anything else is inspected"""
+        takes_batch = getattr(handler, '_accepts_events', None)
+        if not isinstance(takes_batch, bool):
+            takes_batch = accepts_events(handler)
+        if takes_batch:
+            return _EVENT_BATCH
+        takes_event = getattr(handler, '_accepts_event', None)
+        if not isinstance(takes_event, bool):
+            takes_event = accepts_event(handler)
+        return _LATEST_EVENT if takes_event else _NO_EVENT
 
     def _is_valid_transition(self, from_state: str, to_state: str) -> bool:
         """Check if transition is allowed by transition map"""
-        if not self._transition_map:
+        transition_map = self._transition_map
+        if not transition_map:
             return True  # No restrictions if no map defined
 
-        allowed_states = self._transition_map.get(from_state, set())
-        return to_state in allowed_states
+        compiled = self._compiled_transitions
+        if compiled is None or compiled[0] is not transition_map:
+            # Not the read-only map @transitions compiled, it can be replaced or edited in place so check it directly
+            targets = transition_map.get(from_state)
+            return targets is not None and to_state in targets
+
+        _, state_ids, masks = compiled
+        from_id = state_ids.get(from_state)
+        to_id = state_ids.get(to_state)
+        if from_id is None or to_id is None:
+            return False
+        return bool(masks[from_id] >> to_id & 1)
 
     async def transition_to(self, new_state: str) -> bool:
         """Transition to a new state"""
@@ -89,71 +188,121 @@ class StateMachine(Generic[T]):
         # Update state tracking
         self._previous_state = self._current_state
         self._current_state = new_state
-        self._state_start_time = time.monotonic()
+        self._state_start_time_ns = time.monotonic_ns()
 
-        self._logger.info(f"Transitioned from {self._previous_state} to {self._current_state}")
+        # Formatted lazily, this runs on every transition
+        self._logger.info("Transitioned from %s to %s", self._previous_state, new_state)
 
         # Publish state change if this is a publisher
         if hasattr(self, 'publish') and self._state_change_event_type:
-            await self.publish(
-                Event(
-                    type=self._state_change_event_type,
-                    source=self.__class__.__name__,
-                    payload={
-                        'previous_state': self._previous_state,
-                        'current_state': self._current_state,
-                        'timestamp': self._state_start_time
-                    }
-                )
-            )
+            await self.publish(self._build_state_change_event())
 
         return True
 
+    def _build_state_change_event(self) -> Event[T]:
+        """State change event for the transition that just happened, built without pydantic validation"""
+        # Every field is already known to be valid, skip validating them on each transition
+        return Event.model_construct(
+            type=self._state_change_event_type,
+            source=self.__class__.__name__,
+            payload={
+                'previous_state': self._previous_state,
+                'current_state': self._current_state,
+                'timestamp': self._state_start_time
+            }
+        )
+
     async def _run_state_machine(self) -> None:
         """State machine loop. State handlers return: str (next state), None (stay), or False (stop)."""
         self._state_machine_running = True
-
-        while self._state_machine_running and self._current_state:
-            try:
+        # Handlers may have been replaced since __init__
+        self._index_state_handlers()
+
+        # Read once, none of these change while the loop runs, the bound handlers only live as long as the loop
+        handlers_by_id = [
+            self._bind_handler(state_name, handler)
+            for state_name, handler in zip(self._state_handlers, self._handlers_by_id, strict=True)
+        ]
+        event_modes_by_id = self._event_modes_by_id
+        transition_to = self.transition_to
+        logger = self._logger
+
+        try:
+            while self._state_machine_running and self._current_state_name:
                 # Get current state handler
-                handler = self._state_handlers[self._current_state]
-
-                # Call state method, the state method decorator handles polling so
-                # don't worry about this blocking
-                if self._current_event:
-                    next_state = await handler(self._current_event)
-                    self._current_event = None  # Clear after use
+                state_id = self._current_state_id
+                handler: Callable | None
+                if state_id is not None:
+                    handler = handlers_by_id[state_id]
+                    event_mode = event_modes_by_id[state_id]
                 else:
-                    next_state = await handler()
-
-                # Handle state transition
-                if isinstance(next_state, str) and next_state != self._current_state:
-                    if next_state != 'error':
-                        self._consecutive_errors = 0
-                    await self.transition_to(next_state)
-                elif next_state is False:
-                    # State returned False, stop machine
-                    self._logger.info("State machine stopped by state method")
-                    break
-            except Exception as original_error:
-                self._consecutive_errors += 1
-                if self._consecutive_errors >= self._max_consecutive_errors:
-                    self._logger.critical("Too many consecutive errors, stopping state machine")
-                    break
-
-                self._logger.error(
-                    f"State machine error in {self._current_state}: {original_error}"
-                )
-                if 'error' in self._state_handlers:
-                    try:
-                        await self.transition_to('error')
-                        continue
-                    except Exception as transition_error:
-                        self._logger.critical(f"Failed to transition to error state: {transition_error}")
+                    # Not numbered, e.g. handlers changed while running, look it up by name
+                    handler = self._state_handlers.get(self._current_state_name)
+                    if handler is None:
+                        # Nothing raised here, so no exception is built just to be caught below
+                        if await self._handle_state_error(f"no handler for state {self._current_state_name}"):
+                            continue
                         break
-                else:
-                    self._logger.info("No error state handler, shutting down ...")
+                    # Not in the precomputed list, inspected each tick until the loop indexes it on its next run
+                    event_mode = self._event_mode(handler)
+                    handler = self._bind_handler(self._current_state_name, handler)
+
+                try:
+                    # Call state method, the state method decorator handles polling so
+                    # don't worry about this blocking
+                    # A handler without an event parameter leaves the events for a state that takes them
+                    pending = self._pending_events
+                    if pending and event_mode:
+                        # Taken before awaiting so events arriving meanwhile are kept for the next tick
+                        self._pending_events = deque(maxlen=pending.maxlen)
+                        try:
+                            if event_mode == _EVENT_BATCH:
+                                next_state = await handler(events=list(pending))
+                            else:
+                                next_state = await handler(pending[-1])  # Latest wins, like a single slot
+                        except BaseException:
+                            # Put them back for the error state, ahead of newer ones, overflow still drops the oldest
+                            self._pending_events = deque([*pending, *self._pending_events], maxlen=pending.maxlen)
+                            raise
+                    else:
+                        next_state = await handler()
+
+                    # Handle state transition
+                    if isinstance(next_state, str) and next_state != self._current_state_name:
+                        if next_state != 'error':
+                            self._consecutive_errors = 0
+                        await transition_to(next_state)
+                    elif next_state is False:
+                        # State returned False, stop machine
+                        logger.info("State machine stopped by state method")
+                        break
+                except Exception as original_error:
+                    if await self._handle_state_error(original_error):
+                        continue
                     break
+        finally:
+            # Also when awaited directly rather than through start(), is_running must not outlive the loop
+            self._state_machine_running = False
+
+    async def _handle_state_error(self, error: Exception | str) -> bool:
+        """Count a failed tick and move to the error state if there is one, False means stop the machine"""
+        self._consecutive_errors += 1
+        if self._consecutive_errors >= self._max_consecutive_errors:
+            self._logger.critical("Too many consecutive errors, stopping state machine")
+            return False
+
+        self._logger.error("State machine error in %s: %s", self._current_state_name, error)
+        # Read live, handlers can change while the loop runs and this only runs on failed ticks
+        if 'error' not in self._state_handlers:
+            self._logger.info("No error state handler, shutting down ...")
+            return False
+
+        try:
+            await self.transition_to('error')
+        except Exception as transition_error:
+            self._logger.critical("Failed to transition to error state: %s", transition_error)
+            return False
+        return True
 
     async def start(self) -> bool:
         """Start the state machine"""
@@ -165,13 +314,20 @@ class StateMachine(Generic[T]):
                 return False
 
         if not self._state_task or self._state_task.done():
-            self._state_task = create_task(self._run_state_machine())
+            self._state_machine_running = True
+            self._state_task = self._spawn(self._run_state_machine())
+            self._state_task.add_done_callback(self._on_state_task_done)
             self._logger.info("State machine started")
             return True
         else:
             self._logger.warning("State machine already running")
             return False
 
+    def _on_state_task_done(self, task: Task) -> None:
+        """Clear the running flag once the loop task ends, however it ended"""
+        if task is self._state_task:
+            self._state_machine_running = False
+
     async def stop(self) -> None:
         """Stop the state machine"""
         self._state_machine_running = False
@@ -181,6 +337,17 @@ class StateMachine(Generic[T]):
                 await self._state_task
         self._logger.info("State machine stopped")
 
+    def run_standalone(self) -> None:
+        """Run the state machine on its own event loop from loop_factory, blocks until the machine stops"""
+        with Runner(loop_factory=self._loop_factory) as runner:
+            runner.run(self._run_until_stopped())
+
+    async def _run_until_stopped(self) -> None:
+        """Start, then wait for the loop task to end"""
+        if await self.start() and self._state_task:
+            with suppress(CancelledError):
+                await self._state_task
+
     async def restart(self) -> None:
         """Reset error count and restart state machine"""
         self._consecutive_errors = 0
@@ -193,6 +360,7 @@ class StateMachine(Generic[T]):
 
     def get_poll_interval(self, state_name: str) -> float:
         """Get current polling interval for a state"""
+        # Same attribute the @state wrapper sleeps on
         if hasattr(self, f'_{state_name}_poll_interval'):
             interval = getattr(self, f'_{state_name}_poll_interval')
             return float(interval)
@@ -204,6 +372,33 @@ class StateMachine(Generic[T]):
 
         return 0.1  # Fallback
 
+    @property
+    def _current_state(self) -> str | None:
+        """Name of the current state, setting it also resolves the state's handler id"""
+        return self._current_state_name
+
+    @_current_state.setter
+    def _current_state(self, state_name: str | None) -> None:
+        self._current_state_name = state_name
+        self._current_state_id = None if state_name is None else self._handler_ids.get(state_name)
+
+    @property
+    def _has_event(self) -> bool:
+        """Whether any event is waiting for a state to take it"""
+        return bool(self._pending_events)
+
+    @property
+    def _current_event(self) -> Event[T] | None:
+        """Latest event waiting for a state, None once a state took it"""
+        pending = self._pending_events
+        return pending[-1] if pending else None
+
+    @_current_event.setter
+    def _current_event(self, event: Event[T] | None) -> None:
+        self._pending_events.clear()
+        if event is not None:
+            self._pending_events.append(event)
+
     # For introspection/debugging/monitoring
     @property
     def current_state(self) -> str | None:
@@ -216,17 +411,28 @@ class StateMachine(Generic[T]):
     @property
     def state_uptime(self) -> float:
         if self._current_state:
-            return time.monotonic() - self._state_start_time
+            return (time.monotonic_ns() - self._state_start_time_ns) * 1e-9
         return 0.0
 
     @property
-    def available_states(self) -> set[str]:
-        return set(self._state_handlers.keys())
+    def _state_start_time(self) -> float:
+        """Seconds view of _state_start_time_ns, same clock as time.monotonic()"""
+        return self._state_start_time_ns * 1e-9
+
+    @_state_start_time.setter
+    def _state_start_time(self, value: float) -> None:
+        self._state_start_time_ns = int(value * 1e9)
+
+    @property
+    def available_states(self) -> frozenset[str]:
+        handlers, states = self._available_states
+        # Handlers can be replaced or added after init, only reuse the set built from this dict at its current size
+        if handlers is not self._state_handlers or len(states) != len(handlers):
+            states = frozenset(self._state_handlers)
+            self._available_states = (self._state_handlers, states)
+        return states
 
     @property
     def is_running(self) -> bool:
-        return bool(
-            self._state_machine_running and
-            self._state_task and
-            not self._state_task.done()
-        )
\ No newline at end of file
+        # Cleared by stop() and by the loop task's done callback
+        return self._state_machine_running
\ No newline at end of file
@@ -0,0 +1,79 @@
+import copy
+import logging
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from events import Broker
+from events.core.registry import ComponentRegistry, _registry_var
+
+
+def _fresh_copy(prototype):
+    """Shallow copy a mock prototype with its own children and call records"""
+    mock = copy.copy(prototype)
+    # copy.copy shares the child table, so child call records would leak between tests
+    mock.__dict__['_mock_children'] = {}
+    mock.reset_mock()
+    return mock
+
+
+@pytest.fixture(autouse=True)
+def registry():
+    """Give every test its own empty registry instead of clearing the global one"""
+    fresh = ComponentRegistry()
+    token = _registry_var.set(fresh)
+    yield fresh
+    _registry_var.reset(token)
+
+
+class CountingHandler:
+    """Sync event handler that only records how often it was called and with what"""
+
+    __slots__ = ('calls', 'last')
+
+    def __init__(self):
+        self.calls = 0
+        self.last = None
+
+    def __call__(self, event):
+        self.calls += 1
+        self.last = event
+
+
+@pytest.fixture
+def counting_handler():
+    """Cheaper stand-in for Mock() handlers in tests that only count calls"""
+    return CountingHandler()
+
+
+@pytest.fixture(scope="session")
+def _mock_broker_proto():
+    return Mock(spec=Broker)
+
+
+@pytest.fixture(scope="session")
+def _async_mock_broker_proto():
+    return AsyncMock(spec_set=Broker)
+
+
+@pytest.fixture
+def mock_broker(_mock_broker_proto):
+    """Broker double, async methods are AsyncMocks via the spec"""
+    return _fresh_copy(_mock_broker_proto)
+
+
+@pytest.fixture
+def async_mock_broker(_async_mock_broker_proto):
+    """AsyncMock broker double, sync methods stay MagicMocks and unknown attributes can't be set"""
+    return _fresh_copy(_async_mock_broker_proto)
+
+
+@pytest.fixture
+def first_warning(caplog):
+    """Return a lookup for the first captured WARNING+ record containing a substring"""
+    def _get(substr):
+        return next(
+            (r for r in caplog.records if r.levelno >= logging.WARNING and substr in r.getMessage()),
+            None
+        )
+    return _get
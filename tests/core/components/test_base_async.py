@@ -0,0 +1,17 @@
+import pytest
+
+from events.core.components._base import Base
+
+
+class TestBaseAsync:
+    @pytest.mark.asyncio
+    async def test_startup_default_implementation(self):
+        base = Base()
+        # Should not raise - default implementation does nothing
+        await base.startup()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_default_implementation(self):
+        base = Base()
+        # Should not raise - default implementation does nothing
+        await base.shutdown()
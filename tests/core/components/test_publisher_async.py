@@ -0,0 +1,36 @@
+import logging
+
+import pytest
+
+from events import Publisher
+
+
+class TestPublisherAsync:
+    @pytest.mark.asyncio
+    async def test_publish_with_broker(self, async_mock_broker, event):
+        """Test publishing when broker is available"""
+        publisher = Publisher(broker=async_mock_broker)
+
+        await publisher.publish(event)
+
+        async_mock_broker.publish.assert_awaited_once_with(event)
+
+    @pytest.mark.asyncio
+    async def test_publish_without_broker_logs_warning(self, caplog, first_warning, event):
+        """Test publishing when no broker available logs warning"""
+        publisher = Publisher()
+        caplog.set_level(logging.WARNING, logger=publisher._logger.name)
+
+        await publisher.publish(event)
+
+        rec = first_warning("not registered with broker")
+        assert rec is not None
+        assert publisher.__class__.__name__ in rec.getMessage()
+
+    @pytest.mark.asyncio
+    async def test_default_run_method(self):
+        """Test that default run method exists and doesn't crash"""
+        publisher = Publisher()
+
+        # Should not raise - default implementation is pass
+        await publisher.run()
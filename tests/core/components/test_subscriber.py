@@ -1,15 +1,14 @@
+from unittest.mock import Mock, call
+
 import pytest
-from unittest.mock import Mock
-from events import Subscriber, Event, EventType
 
+from events import Subscriber, subscribes
 
-class MockEvents(EventType):
-    TEST_EVENT = "test_event"
-    ANOTHER_EVENT = "another_event"
+from ..conftest import MockEvents
 
 
-class TestSubscriber:
-    def test_initialization(self):
+class TestSubscriberSync:
+    def test_initialization(self, mock_broker):
         """Test subscriber initialization with and without broker"""
         # Without broker
         subscriber = Subscriber()
@@ -18,36 +17,49 @@ class TestSubscriber:
         assert subscriber._logger is not None
 
         # With broker
-        mock_broker = Mock()
         subscriber_with_broker = Subscriber(broker=mock_broker)
         assert subscriber_with_broker._broker is mock_broker
 
-    def test_subscribe_to_with_broker_immediate_registration(self):
+    def test_subscriptions_share_one_bound_handler(self, mock_broker):
+        """Test every subscription hands the broker the same cached bound handler"""
+        subscriber = Subscriber(broker=mock_broker)
+
+        subscriber.subscribe_to(MockEvents.TEST_EVENT)
+        subscriber.subscribe_to(MockEvents.ANOTHER_EVENT)
+
+        first, second = (c.args[1] for c in mock_broker.subscribe.call_args_list)
+        assert first is second is subscriber._handle_event_bound
+        assert subscriber._handle_event_bound == subscriber.handle_event
+
+    def test_subscribe_to_with_broker_immediate_registration(self, mock_broker):
         """Test immediate subscription when broker is available"""
-        mock_broker = Mock()
         subscriber = Subscriber(broker=mock_broker)
 
         subscriber.subscribe_to(MockEvents.TEST_EVENT)
 
         # Should register immediately with broker
-        mock_broker.subscribe.assert_called_once_with(MockEvents.TEST_EVENT, subscriber.handle_event)
+        mock_broker.subscribe.assert_called_once_with(MockEvents.TEST_EVENT, subscriber._handle_event_bound)
         assert subscriber._pending_subscriptions == []
 
-    def test_subscribe_to_without_broker_stores_pending(self):
+    @pytest.mark.parametrize("event_types, expected_len", [
+        ((MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT), 2),
+        # Duplicates are stored as-is, the broker handles deduplication
+        ((MockEvents.TEST_EVENT, MockEvents.TEST_EVENT), 2),
+        ((MockEvents.TEST_EVENT,), 1),
+    ], ids=["distinct", "duplicates", "single"])
+    def test_subscribe_to_without_broker_stores_pending(self, event_types, expected_len):
         """Test pending subscription storage when no broker available"""
         subscriber = Subscriber()
 
-        subscriber.subscribe_to(MockEvents.TEST_EVENT)
-        subscriber.subscribe_to(MockEvents.ANOTHER_EVENT)
+        for event_type in event_types:
+            subscriber.subscribe_to(event_type)
 
-        # Should store both events for later registration
-        assert len(subscriber._pending_subscriptions) == 2
-        assert MockEvents.TEST_EVENT in subscriber._pending_subscriptions
-        assert MockEvents.ANOTHER_EVENT in subscriber._pending_subscriptions
+        # Should store every event for later registration, in order
+        assert len(subscriber._pending_subscriptions) == expected_len
+        assert subscriber._pending_subscriptions == list(event_types)
 
-    def test_register_pending_subscriptions_flow(self):
+    def test_register_pending_subscriptions_flow(self, mock_broker):
         """Test the full pending subscription registration flow"""
-        mock_broker = Mock()
         subscriber = Subscriber()
 
         # Subscribe before broker is available
@@ -59,20 +71,38 @@ class TestSubscriber:
         subscriber._broker = mock_broker
         subscriber.register_pending_subscriptions()
 
-        # Should register all pending subscriptions and clear the list
+        # Should register all pending subscriptions in one call and clear the list
+        mock_broker.subscribe_many.assert_called_once_with(
+            [MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT], subscriber._handle_event_bound
+        )
+        mock_broker.subscribe.assert_not_called()
+        assert subscriber._pending_subscriptions == []
+
+    def test_register_pending_subscriptions_fallback_without_subscribe_many(self):
+        """Test pending subscriptions go through subscribe() when the broker has no subscribe_many"""
+        mock_broker = Mock(spec=['subscribe'])
+        subscriber = Subscriber()
+
+        subscriber.subscribe_to(MockEvents.TEST_EVENT)
+        subscriber.subscribe_to(MockEvents.ANOTHER_EVENT)
+
+        subscriber._broker = mock_broker
+        subscriber.register_pending_subscriptions()
+
         assert mock_broker.subscribe.call_count == 2
-        mock_broker.subscribe.assert_any_call(MockEvents.TEST_EVENT, subscriber.handle_event)
-        mock_broker.subscribe.assert_any_call(MockEvents.ANOTHER_EVENT, subscriber.handle_event)
+        mock_broker.subscribe.assert_has_calls([
+            call(MockEvents.TEST_EVENT, subscriber._handle_event_bound),
+            call(MockEvents.ANOTHER_EVENT, subscriber._handle_event_bound)
+        ], any_order=True)
         assert subscriber._pending_subscriptions == []
 
-    def test_register_pending_subscriptions_edge_cases(self):
+    def test_register_pending_subscriptions_edge_cases(self, mock_broker):
         """Test edge cases for pending subscription registration"""
-        mock_broker = Mock()
-
         # Test with no pending subscriptions
         subscriber = Subscriber(broker=mock_broker)
         subscriber.register_pending_subscriptions()
         mock_broker.subscribe.assert_not_called()
+        mock_broker.subscribe_many.assert_not_called()
 
         # Test without broker (should not raise)
         subscriber_no_broker = Subscriber()
@@ -80,27 +110,51 @@ class TestSubscriber:
         subscriber_no_broker.register_pending_subscriptions()  # Should not crash
         assert len(subscriber_no_broker._pending_subscriptions) == 1
 
-    @pytest.mark.asyncio
-    async def test_default_handle_event_logs_warning(self, caplog):
-        """Test that unhandled events log appropriate warnings"""
-        subscriber = Subscriber()
-        event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+    def test_class_subscriptions_registered_with_broker(self, mock_broker):
+        """Test @subscribes handlers are collected per class and subscribed on registration"""
+        class DecoratedSubscriber(Subscriber):
+            @subscribes(MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT)
+            async def handle_event(self, event):
+                pass
 
-        await subscriber.handle_event(event)
+            @subscribes(MockEvents.SYSTEM_ERROR)
+            async def on_error(self, event):
+                pass
 
-        # Should log warning about unhandled event
-        assert "Unhandled event" in caplog.text
-        assert str(MockEvents.TEST_EVENT) in caplog.text
-        assert subscriber.__class__.__name__ in caplog.text
+        class ChildSubscriber(DecoratedSubscriber):
+            async def on_error(self, event):
+                pass
 
-    def test_pending_subscription_behavior_with_duplicates(self):
-        """Test that duplicate subscriptions are handled (stored as-is for broker to handle)"""
-        subscriber = Subscriber()
+        assert ChildSubscriber._class_subscriptions == DecoratedSubscriber._class_subscriptions
+        assert Subscriber._class_subscriptions == ()
 
-        # Subscribe to same event multiple times
-        subscriber.subscribe_to(MockEvents.TEST_EVENT)
-        subscriber.subscribe_to(MockEvents.TEST_EVENT)
+        subscriber = ChildSubscriber()
+        subscriber._broker = mock_broker
+        subscriber.register_pending_subscriptions()
 
-        # Should store duplicates (broker will handle deduplication)
-        assert len(subscriber._pending_subscriptions) == 2
-        assert all(event == MockEvents.TEST_EVENT for event in subscriber._pending_subscriptions)
+        mock_broker.subscribe_many.assert_has_calls([
+            call((MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT), subscriber._handle_event_bound),
+            call((MockEvents.SYSTEM_ERROR,), subscriber.on_error)
+        ])
+        assert mock_broker.subscribe_many.call_count == 2
+
+    def test_class_subscriptions_registered_once_per_broker(self, mock_broker, async_mock_broker):
+        """Test repeated registration doesn't subscribe @subscribes handlers again on the same broker"""
+        class DecoratedSubscriber(Subscriber):
+            @subscribes(MockEvents.TEST_EVENT)
+            async def handle_event(self, event):
+                pass
+
+        subscriber = DecoratedSubscriber()
+        subscriber._broker = mock_broker
+        subscriber.register_pending_subscriptions()
+        subscriber.register_pending_subscriptions()
+
+        mock_broker.subscribe_many.assert_called_once_with((MockEvents.TEST_EVENT,), subscriber._handle_event_bound)
+
+        # A different broker still gets its own subscriptions
+        subscriber._broker = async_mock_broker
+        subscriber.register_pending_subscriptions()
+        async_mock_broker.subscribe_many.assert_called_once_with(
+            (MockEvents.TEST_EVENT,), subscriber._handle_event_bound
+        )
@@ -0,0 +1,25 @@
+import logging
+
+import pytest
+
+from events import Subscriber
+
+from ..conftest import MockEvents
+
+TEST_EVENT_STR = str(MockEvents.TEST_EVENT)
+
+
+class TestSubscriberAsync:
+    @pytest.mark.asyncio
+    async def test_default_handle_event_logs_warning(self, caplog, first_warning, event):
+        """Test that unhandled events log appropriate warnings"""
+        subscriber = Subscriber()
+        caplog.set_level(logging.WARNING, logger=subscriber._logger.name)
+
+        await subscriber.handle_event(event)
+
+        # Should log warning about unhandled event
+        rec = first_warning("Unhandled event")
+        assert rec is not None
+        assert TEST_EVENT_STR in rec.getMessage()
+        assert subscriber.__class__.__name__ in rec.getMessage()
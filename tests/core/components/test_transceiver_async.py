@@ -0,0 +1,20 @@
+import pytest
+
+from events import Transceiver
+
+from ..conftest import MockEvents
+
+
+class TestTransceiverAsync:
+    @pytest.mark.asyncio
+    async def test_publish_and_subscribe_integration(self, async_mock_broker, event):
+        """Test that both publish and subscribe functionality work together"""
+        transceiver = Transceiver(broker=async_mock_broker)
+
+        # Test subscribe functionality
+        transceiver.subscribe_to(MockEvents.TEST_EVENT)
+        async_mock_broker.subscribe.assert_called_once_with(MockEvents.TEST_EVENT, transceiver._handle_event_bound)
+
+        # Test publish functionality
+        await transceiver.publish(event)
+        async_mock_broker.publish.assert_awaited_once_with(event)
@@ -0,0 +1,30 @@
+import pytest
+
+from events import Event, EventType, get_component_registry
+
+
+class MockEvents(EventType):
+    TEST_EVENT = "test_event"
+    ANOTHER_EVENT = "another_event"
+    SENSOR_DATA = "sensor_data"
+    SYSTEM_ERROR = "system_error"
+
+
+@pytest.fixture(scope="session")
+def _event_proto():
+    return Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+
+
+@pytest.fixture
+def event(_event_proto):
+    """Validated TEST_EVENT, copied from a prototype built once per session"""
+    return _event_proto.model_copy(deep=True)
+
+
+@pytest.fixture
+def registrations():
+    """Registrations in the context registry, optionally narrowed to one bucket"""
+    def _get(bucket=None):
+        all_regs = get_component_registry().get_all_registrations()
+        return all_regs[bucket] if bucket else all_regs
+    return _get
@@ -0,0 +1,22 @@
+from events import Publisher, Subscriber, Transceiver
+
+
+class MockPublisher(Publisher):
+    def __init__(self, pin=None, name=None, param1=None, param2=None):
+        super().__init__()
+        self.pin = pin
+        self.name = name
+        self.param1 = param1
+        self.param2 = param2
+
+
+class MockSubscriber(Subscriber):
+    def __init__(self, sensor_id=None, interval=None, config=None):
+        super().__init__()
+        self.sensor_id = sensor_id
+        self.interval = interval
+        self.config = config
+
+
+class MockTransceiver(Transceiver):
+    pass
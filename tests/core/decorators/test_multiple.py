@@ -1,30 +1,12 @@
-from events import register_multiple, Publisher, Subscriber, Transceiver, component_registry
+import pytest
 
+from events import register_multiple
 
-class MockPublisher(Publisher):
-    def __init__(self, pin=None, name=None):
-        super().__init__()
-        self.pin = pin
-        self.name = name
-
-
-class MockSubscriber(Subscriber):
-    def __init__(self, sensor_id=None, interval=None):
-        super().__init__()
-        self.sensor_id = sensor_id
-        self.interval = interval
-
-
-class MockTransceiver(Transceiver):
-    pass
+from .conftest import MockPublisher, MockSubscriber, MockTransceiver
 
 
 class TestRegisterMultiple:
-    def setup_method(self):
-        """Clear registry before each test"""
-        component_registry.clear()
-
-    def test_register_multiple_instances(self):
+    def test_register_multiple_instances(self, registrations):
         """Test registering multiple instances of same class"""
         instances = [
             {"pin": 18, "name": "button1"},
@@ -37,7 +19,7 @@ class TestRegisterMultiple:
             pass
 
         # Should have registered all instances
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['publishers']) == 3
 
         # Check each registration
@@ -47,10 +29,10 @@ class TestRegisterMultiple:
             assert reg['auto_start'] is True
             assert reg['component_id'] == f"GPIOPublisher_{i}"
 
-        # Class should have auto_start attribute
-        assert GPIOPublisher._auto_start is True
+        # auto_start lives on the registrations only, the class is left untouched
+        assert not hasattr(GPIOPublisher, '_auto_start')
 
-    def test_register_multiple_with_auto_start_false(self):
+    def test_register_multiple_with_auto_start_false(self, registrations):
         """Test auto_start=False parameter"""
         instances = [
             {"sensor_id": "temp_1", "interval": 2.0},
@@ -61,16 +43,14 @@ class TestRegisterMultiple:
         class SensorSubscriber(MockSubscriber):
             pass
 
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['subscribers']) == 2
 
         # Both should have auto_start=False
         for reg in all_regs['subscribers']:
             assert reg['auto_start'] is False
 
-        assert SensorSubscriber._auto_start is False
-
-    def test_register_multiple_with_custom_id(self):
+    def test_register_multiple_with_custom_id(self, registrations):
         """Test custom ID parameter"""
         instances = [
             {"param1": "value1"},
@@ -81,7 +61,7 @@ class TestRegisterMultiple:
         class CustomTransceiver(MockTransceiver):
             pass
 
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['transceivers']) == 2
 
         # Should use custom ID with index suffix
@@ -89,7 +69,7 @@ class TestRegisterMultiple:
         actual_ids = [reg['component_id'] for reg in all_regs['transceivers']]
         assert actual_ids == expected_ids
 
-    def test_register_multiple_empty_list(self):
+    def test_register_multiple_empty_list(self, registrations):
         """Test edge case with empty instance list"""
 
         @register_multiple([])
@@ -97,13 +77,11 @@ class TestRegisterMultiple:
             pass
 
         # Should not register any instances
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['publishers']) == 0
+        assert not hasattr(EmptyPublisher, '_auto_start')
 
-        # Should still have auto_start attribute
-        assert EmptyPublisher._auto_start is True
-
-    def test_register_multiple_preserves_class_functionality(self):
+    def test_register_multiple_preserves_class_functionality(self, registrations):
         """Test that decorator doesn't break the class"""
         instances = [{"pin": 1}, {"pin": 2}]
 
@@ -122,28 +100,21 @@ class TestRegisterMultiple:
         assert instance.pin == 5
         assert instance.name == "test"
 
-        # Should have decorator attribute
-        assert hasattr(PreservedClass, '_auto_start')
+        # Should be registered for auto_start
+        assert all(reg['auto_start'] is True for reg in registrations('publishers'))
 
-    def test_component_type_detection(self):
+    @pytest.mark.parametrize("base, bucket", [
+        (MockPublisher, 'publishers'),
+        (MockSubscriber, 'subscribers'),
+        (MockTransceiver, 'transceivers'),
+    ])
+    def test_component_type_detection(self, base, bucket, registrations, registry):
         """Test that different component types are handled correctly"""
-        instances = [{"param": "value"}]
-
-        @register_multiple(instances)
-        class TestPub(MockPublisher):
-            pass
-
-        @register_multiple(instances)
-        class TestSub(MockSubscriber):
-            pass
-
-        @register_multiple(instances)
-        class TestTrans(MockTransceiver):
-            pass
+        TestClass = register_multiple([{"param": "value"}])(type("TestClass", (base,), {}))
 
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
 
-        # Should be in correct categories
-        assert len(all_regs['publishers']) == 1
-        assert len(all_regs['subscribers']) == 1
-        assert len(all_regs['transceivers']) == 1
+        # Should be in the correct category only
+        assert len(all_regs[bucket]) == 1
+        assert all_regs[bucket][0]['class_'] == TestClass
+        assert registry.total_count == 1
@@ -1,41 +1,23 @@
 import pytest
-from events import register, Publisher, Subscriber, Transceiver, component_registry
 
+from events import register
 
-class MockPublisher(Publisher):
-    def __init__(self, param1=None, param2=None):
-        super().__init__()
-        self.param1 = param1
-        self.param2 = param2
-
-
-class MockSubscriber(Subscriber):
-    def __init__(self, config=None):
-        super().__init__()
-        self.config = config
-
-
-class MockTransceiver(Transceiver):
-    pass
+from .conftest import MockPublisher, MockSubscriber, MockTransceiver
 
 
 class TestRegisterDecorator:
-    def setup_method(self):
-        """Clear registry before each test"""
-        component_registry.clear()
-
-    def test_register_without_arguments(self):
+    def test_register_without_arguments(self, registrations):
         """Test @register decorator without arguments"""
 
         @register
         class TestPublisher(MockPublisher):
             pass
 
-        # Should add class attribute
-        assert TestPublisher._auto_start is True
+        # auto_start lives on the registration only, the class is left untouched
+        assert not hasattr(TestPublisher, '_auto_start')
 
         # Should register with component registry
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['publishers']) == 1
 
         pub_reg = all_regs['publishers'][0]
@@ -43,93 +25,67 @@ class TestRegisterDecorator:
         assert pub_reg['constructor_kwargs'] == {}
         assert pub_reg['auto_start'] is True
 
-    def test_register_with_constructor_kwargs(self):
+    def test_register_with_constructor_kwargs(self, registrations):
         """Test @register with constructor arguments"""
 
         @register(config="test_config", timeout=30)
         class TestSubscriber(MockSubscriber):
             pass
 
-        assert TestSubscriber._auto_start is True
-
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['subscribers']) == 1
 
         sub_reg = all_regs['subscribers'][0]
         assert sub_reg['class_'] == TestSubscriber
+        assert sub_reg['auto_start'] is True
         assert sub_reg['constructor_kwargs'] == {'config': 'test_config', 'timeout': 30}
 
-    def test_register_with_auto_start_false(self):
+    def test_register_with_auto_start_false(self, registrations):
         """Test @register with auto_start=False"""
 
         @register(auto_start=False, param="value")
         class TestTransceiver(MockTransceiver):
             pass
 
-        assert TestTransceiver._auto_start is False
-
-        all_regs = component_registry.get_all_registrations()
+        all_regs = registrations()
         assert len(all_regs['transceivers']) == 1
 
         trans_reg = all_regs['transceivers'][0]
         assert trans_reg['auto_start'] is False
         assert trans_reg['constructor_kwargs'] == {'param': 'value'}
 
-    def test_register_syntax_variations(self):
+    @pytest.mark.parametrize("decorator", [
+        register,  # @register
+        register(),  # @register()
+        register(param="value"),  # @register(param=value)
+    ], ids=["bare", "empty_call", "with_kwargs"])
+    def test_register_syntax_variations(self, decorator, registrations):
         """Test different decorator syntax variations work"""
+        TestClass = decorator(type("TestClass", (MockPublisher,), {}))
 
-        # @register
-        @register
-        class TestClass1(MockPublisher):
-            pass
-
-        # @register()
-        @register()
-        class TestClass2(MockPublisher):
-            pass
-
-        # @register(param=value)
-        @register(param="value")
-        class TestClass3(MockPublisher):
-            pass
-
-        # All should have _auto_start attribute
-        assert TestClass1._auto_start is True
-        assert TestClass2._auto_start is True
-        assert TestClass3._auto_start is True
-
-        # All should be registered
-        all_regs = component_registry.get_all_registrations()
-        assert len(all_regs['publishers']) == 3
-
-    def test_component_type_detection(self):
+        # Should be registered with auto_start
+        all_regs = registrations()
+        assert len(all_regs['publishers']) == 1
+        assert all_regs['publishers'][0]['class_'] == TestClass
+        assert all_regs['publishers'][0]['auto_start'] is True
+
+    @pytest.mark.parametrize("base, bucket", [
+        (MockPublisher, 'publishers'),
+        (MockSubscriber, 'subscribers'),
+        (MockTransceiver, 'transceivers'),
+    ])
+    def test_component_type_detection(self, base, bucket, registrations, registry):
         """Test that different component types are registered correctly"""
+        TestClass = register(type("TestClass", (base,), {}))
 
-        @register
-        class TestPub(MockPublisher):
-            pass
-
-        @register
-        class TestSub(MockSubscriber):
-            pass
-
-        @register
-        class TestTrans(MockTransceiver):
-            pass
-
-        all_regs = component_registry.get_all_registrations()
-
-        # Should be in correct categories
-        assert len(all_regs['publishers']) == 1
-        assert len(all_regs['subscribers']) == 1
-        assert len(all_regs['transceivers']) == 1
+        all_regs = registrations()
 
-        # Check class types
-        assert all_regs['publishers'][0]['class_'] == TestPub
-        assert all_regs['subscribers'][0]['class_'] == TestSub
-        assert all_regs['transceivers'][0]['class_'] == TestTrans
+        # Should be in the correct category only
+        assert len(all_regs[bucket]) == 1
+        assert all_regs[bucket][0]['class_'] == TestClass
+        assert registry.total_count == 1
 
-    def test_register_preserves_class_functionality(self):
+    def test_register_preserves_class_functionality(self, registrations):
         """Test that decorator doesn't break the class"""
 
         @register(param="test")
@@ -146,8 +102,8 @@ class TestRegisterDecorator:
         assert instance.custom_method() == "custom_result"
         assert instance.param1 is None  # From MockPublisher.__init__
 
-        # Should have decorator attribute
-        assert TestClass._auto_start is True
+        # Should be registered with auto_start
+        assert registrations('publishers')[0]['auto_start'] is True
 
     def test_invalid_component_type_raises_error(self):
         """Test that invalid component types raise error"""
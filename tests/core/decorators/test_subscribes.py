@@ -0,0 +1,31 @@
+import pytest
+
+from events import subscribes
+
+from ..conftest import MockEvents
+
+
+class TestSubscribesDecorator:
+    def test_marks_method_with_event_types(self):
+        """Test the decorator records event types and returns the function unchanged"""
+        async def handler(self, event):
+            pass
+
+        decorated = subscribes(MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT)(handler)
+
+        assert decorated is handler
+        assert decorated._event_types == (MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT)
+
+    def test_stacked_decorators_accumulate(self):
+        """Test stacking the decorator adds to the recorded event types"""
+        @subscribes(MockEvents.TEST_EVENT)
+        @subscribes(MockEvents.SENSOR_DATA)
+        async def handler(self, event):
+            pass
+
+        assert handler._event_types == (MockEvents.SENSOR_DATA, MockEvents.TEST_EVENT)
+
+    def test_requires_event_types(self):
+        """Test the decorator without event types raises error"""
+        with pytest.raises(ValueError, match="at least one event type"):
+            subscribes()
@@ -1,18 +1,9 @@
 import pytest
-from events.core.decorators._utils import determine_component_type
-from events import Transceiver, Publisher, Subscriber
-
-
-class MockPublisher(Publisher):
-    pass
-
-
-class MockSubscriber(Subscriber):
-    pass
 
+from events import Transceiver
+from events.core.decorators._utils import determine_component_type
 
-class MockTransceiver(Transceiver):
-    pass
+from .conftest import MockPublisher, MockSubscriber, MockTransceiver
 
 
 class InvalidClass:
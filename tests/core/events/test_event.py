@@ -1,9 +1,6 @@
-from events import Event, EventType
+from events import Event
 
-
-class MockEvents(EventType):
-    SENSOR_DATA = "sensor_data"
-    SYSTEM_ERROR = "system_error"
+from ..conftest import MockEvents
 
 
 class TestEvent:
@@ -19,8 +16,13 @@ class TestEvent:
         # Test that EventType extension works correctly
         event = Event(type=MockEvents.SYSTEM_ERROR, source="cpu_monitor", payload={"error": "overheating"})
 
-        assert event.type == "system_error"  # String value
-        assert event.type == MockEvents.SYSTEM_ERROR  # Enum equality
+        assert event.type is MockEvents.SYSTEM_ERROR  # Stored as the enum member itself
+        assert event.type.value == "system_error"  # String value
+
+    def test_parametrized_event_coerces_string_to_member(self):
+        event = Event[MockEvents](type="system_error", source="cpu_monitor", payload={})
+
+        assert event.type is MockEvents.SYSTEM_ERROR
 
     def test_timestamp_ordering_for_sequencing(self):
         event1 = Event(type=MockEvents.SENSOR_DATA, source="sensor1", payload={})
@@ -22,3 +22,12 @@ class TestEventType:
         # Should work with Event class
         event = Event(type=MyEvents.SENSOR_DATA, source="sensor", payload={})
         assert event.type == "sensor_data"
+
+    def test_event_type_hashes_with_str_slot(self):
+        class MyEvents(EventType):
+            SENSOR_DATA = "sensor_data"
+
+        # Broker dispatch keys dicts by event type, members must use str's C hash, not Enum.__hash__
+        assert MyEvents.__hash__ is str.__hash__
+        assert hash(MyEvents.SENSOR_DATA) == hash("sensor_data")
+        assert {MyEvents.SENSOR_DATA: 1}["sensor_data"] == 1
@@ -1,5 +1,7 @@
+from dataclasses import FrozenInstanceError
+
 import pytest
-from pydantic import ValidationError
+
 from events import ComponentRegistration
 
 
@@ -38,17 +40,35 @@ class TestComponentRegistration:
     def test_required_fields_validation(self):
         """Test that required fields are properly validated"""
         # No fields at all
-        with pytest.raises(ValidationError):
+        with pytest.raises(TypeError):
             ComponentRegistration()
 
         # Missing component_id
-        with pytest.raises(ValidationError):
+        with pytest.raises(TypeError):
             ComponentRegistration(**{"class": MockComponent})
 
         # Missing class
-        with pytest.raises(ValidationError):
+        with pytest.raises(TypeError):
             ComponentRegistration(component_id="test")
 
+        # Unknown field
+        with pytest.raises(TypeError):
+            ComponentRegistration(**{"class": MockComponent, "component_id": "test", "extra": 1})
+
+    def test_class_field_alias(self):
+        """Test the class can be given as either 'class' or 'class_'"""
+        by_alias = ComponentRegistration(**{"class": MockComponent, "component_id": "test"})
+        by_name = ComponentRegistration(class_=MockComponent, component_id="test")
+
+        assert by_alias == by_name
+
+    def test_registration_is_immutable(self):
+        """Test registrations can't be modified after creation"""
+        registration = ComponentRegistration(**{"class": MockComponent, "component_id": "test"})
+
+        with pytest.raises(FrozenInstanceError):
+            registration.auto_start = False
+
     def test_model_serialization(self):
         """Test model_dump() serialization"""
         registration = ComponentRegistration(**{
@@ -69,3 +89,14 @@ class TestComponentRegistration:
         # Verify it contains all expected keys
         expected_keys = {"class_", "constructor_kwargs", "auto_start", "component_id"}
         assert set(dumped.keys()) == expected_keys
+
+    def test_model_dump_matches_to_dict(self):
+        """Test model_dump() is an alias of to_dict()"""
+        registration = ComponentRegistration(**{
+            "class": MockComponent,
+            "constructor_kwargs": {"param": "value"},
+            "component_id": "alias_test"
+        })
+
+        assert registration.model_dump() == registration.to_dict()
+        assert registration.to_dict() is not registration.to_dict()
@@ -1,5 +1,13 @@
+import contextvars
+
 import pytest
-from events.core.registry import ComponentRegistry, ComponentRegistration, component_registry
+
+from events.core.registry import (
+    ComponentRegistration,
+    ComponentRegistry,
+    component_registry,
+    get_component_registry,
+)
 
 
 class MockPublisher:
@@ -19,9 +27,9 @@ class TestComponentRegistry:
         """Test registry initializes empty"""
         registry = ComponentRegistry()
 
-        assert registry.publishers == []
-        assert registry.subscribers == []
-        assert registry.transceivers == []
+        assert registry.publishers == ()
+        assert registry.subscribers == ()
+        assert registry.transceivers == ()
         assert registry.total_count == 0
 
     def test_add_registration_all_types(self):
@@ -49,13 +57,44 @@ class TestComponentRegistry:
         with pytest.raises(ValueError, match="Unknown component type: invalid_type"):
             registry.add_registration("invalid_type", registration)
 
+    @pytest.mark.parametrize("component_type", ["publisher", "Publishers", "", "_count"])
+    def test_rejected_type_leaves_registry_untouched(self, component_type):
+        """Test a rejected component type doesn't touch the count or the cached view"""
+        registry = ComponentRegistry()
+        registry.add_registration(
+            "publishers", ComponentRegistration(**{"class": MockPublisher, "component_id": "pub1"})
+        )
+        cached = registry.get_all_registrations()
+        registration = ComponentRegistration(**{"class": MockSubscriber, "component_id": "bad"})
+
+        with pytest.raises(ValueError, match="Unknown component type"):
+            registry.add_registration(component_type, registration)
+
+        assert registry.total_count == 1
+        assert registry.get_all_registrations() is cached
+
+    def test_rows_are_cached_tuples(self):
+        """Test the per-type views can't be appended to and are reused until the registry changes"""
+        registry = ComponentRegistry()
+        registry.add_registration("publishers",
+                                  ComponentRegistration(**{"class": MockPublisher, "component_id": "pub1"}))
+
+        publishers = registry.publishers
+        assert registry.publishers is publishers
+        with pytest.raises(AttributeError):
+            publishers.append(ComponentRegistration(**{"class": MockPublisher, "component_id": "lost"}))
+
+        registry.add_registration("publishers",
+                                  ComponentRegistration(**{"class": MockPublisher, "component_id": "pub2"}))
+        assert [reg.component_id for reg in registry.publishers] == ["pub1", "pub2"]
+
     def test_get_all_registrations_format(self):
         """Test get_all_registrations returns correct format"""
         registry = ComponentRegistry()
 
         # Test empty case
         all_regs = registry.get_all_registrations()
-        expected_empty = {'publishers': [], 'subscribers': [], 'transceivers': []}
+        expected_empty = {'publishers': (), 'subscribers': (), 'transceivers': ()}
         assert all_regs == expected_empty
 
         # Test with data
@@ -80,6 +119,82 @@ class TestComponentRegistry:
         assert pub_data['constructor_kwargs'] == {"param": "value"}
         assert pub_data['auto_start'] is False
 
+    def test_get_all_registrations_cached_until_mutation(self):
+        """Test get_all_registrations reuses its snapshot until the registry changes"""
+        registry = ComponentRegistry()
+
+        first = registry.get_all_registrations()
+        assert registry.get_all_registrations() is first
+
+        registry.add_registration("publishers",
+                                  ComponentRegistration(**{"class": MockPublisher, "component_id": "pub1"}))
+        after_add = registry.get_all_registrations()
+        assert after_add is not first
+        assert len(after_add['publishers']) == 1
+
+        registry.clear()
+        after_clear = registry.get_all_registrations()
+        assert after_clear is not after_add
+        assert len(after_clear['publishers']) == 0
+
+        # Snapshot is read-only
+        with pytest.raises(TypeError):
+            after_clear['publishers'] = []
+
+    def test_returned_registrations_cannot_corrupt_registry(self):
+        """Test nothing reachable from the cached views can be mutated into the next call or the registry"""
+        registry = ComponentRegistry()
+        constructor_kwargs = {"param": "value"}
+        registry.add_registration("publishers", ComponentRegistration(**{
+            "class": MockPublisher, "component_id": "pub1", "constructor_kwargs": constructor_kwargs
+        }))
+
+        all_regs = registry.get_all_registrations()
+        (auto_start,) = registry.get_auto_start_registrations()
+        with pytest.raises(AttributeError):
+            all_regs['publishers'].append({})
+        for reg in (all_regs['publishers'][0], auto_start):
+            with pytest.raises(TypeError):
+                reg['component_id'] = "other"
+            with pytest.raises(TypeError):
+                reg['constructor_kwargs']['x'] = 1
+
+        assert registry.get_all_registrations()['publishers'][0]['constructor_kwargs'] == {"param": "value"}
+        assert registry.get_auto_start_registrations()[0]['constructor_kwargs'] is not constructor_kwargs
+        assert registry.publishers[0].constructor_kwargs == {"param": "value"}
+
+    def test_get_auto_start_registrations(self):
+        """Test only auto_start registrations are returned, in component type order"""
+        registry = ComponentRegistry()
+
+        registry.add_registration("transceivers",
+                                  ComponentRegistration(**{"class": MockTransceiver, "component_id": "trans1"}))
+        registry.add_registration("publishers", ComponentRegistration(**{
+            "class": MockPublisher,
+            "component_id": "pub1",
+            "constructor_kwargs": {"param": "value"}
+        }))
+        registry.add_registration("subscribers", ComponentRegistration(**{
+            "class": MockSubscriber,
+            "component_id": "sub1",
+            "auto_start": False
+        }))
+
+        auto_start = registry.get_auto_start_registrations()
+
+        assert auto_start == (
+            {'class_': MockPublisher, 'component_id': "pub1", 'constructor_kwargs': {"param": "value"}},
+            {'class_': MockTransceiver, 'component_id': "trans1", 'constructor_kwargs': {}},
+        )
+        assert registry.get_auto_start_registrations() is auto_start
+
+        registry.add_registration("subscribers",
+                                  ComponentRegistration(**{"class": MockSubscriber, "component_id": "sub2"}))
+        assert len(registry.get_auto_start_registrations()) == 3
+
+        registry.clear()
+        assert registry.get_auto_start_registrations() == ()
+
     def test_clear_functionality(self):
         """Test clear removes all registrations"""
         registry = ComponentRegistry()
@@ -117,6 +232,20 @@ class TestComponentRegistry:
         assert ids == ["pub0", "pub1", "pub2"]
 
 
+@pytest.fixture
+def global_registry():
+    """The global registry, with its registrations put back after the test"""
+    snapshot = {
+        component_type: {name: list(column) for name, column in columns.items()}
+        for component_type, columns in component_registry._by_type.items()
+    }
+    count = component_registry._count
+    yield component_registry
+    component_registry._by_type = snapshot
+    component_registry._count = count
+    component_registry._invalidate_caches()
+
+
 class TestGlobalComponentRegistry:
     def test_global_registry_exists_and_singleton(self):
         """Test global registry exists and is singleton"""
@@ -128,21 +257,36 @@ class TestGlobalComponentRegistry:
         from events.core.registry import component_registry as registry2
         assert component_registry is registry2
 
-    def test_global_registry_functionality(self):
+    def test_global_registry_functionality(self, global_registry):
         """Test global registry basic functionality"""
-        # Clean slate
-        component_registry.clear()
-        initial_count = component_registry.total_count
+        initial_count = global_registry.total_count
 
         registration = ComponentRegistration(**{
             "class": MockPublisher,
             "component_id": "global_test"
         })
 
-        component_registry.add_registration("publishers", registration)
+        global_registry.add_registration("publishers", registration)
+
+        assert global_registry.total_count == initial_count + 1
+        assert any(reg.component_id == "global_test" for reg in global_registry.publishers)
+
+    def test_global_registry_is_context_default(self):
+        """Test the global registry is active when no other registry was set"""
+        assert contextvars.Context().run(get_component_registry) is component_registry
+
+    def test_context_registry_isolates_global(self, registry):
+        """Test registrations made through the context registry don't reach the global one"""
+        assert get_component_registry() is registry
+        initial_count = component_registry.total_count
+
+        get_component_registry().add_registration("publishers", ComponentRegistration(
+            **{"class": MockPublisher, "component_id": "context_test"}
+        ))
 
-        assert component_registry.total_count == initial_count + 1
-        assert any(reg.component_id == "global_test" for reg in component_registry.publishers)
+        assert registry.total_count == 1
+        assert component_registry.total_count == initial_count
 
-        # Clean up
-        component_registry.clear()
\ No newline at end of file
+    def test_global_registry_restored_between_tests(self):
+        """Test the global_registry fixture rolled back the previous test's registrations"""
+        assert not any(reg.component_id == "global_test" for reg in component_registry.publishers)
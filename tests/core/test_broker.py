@@ -1,14 +1,14 @@
-import pytest
 import asyncio
-from unittest.mock import Mock, patch
-from events.core.broker import Broker
-from events.core.event import Event, EventType
-from events.core.components import Publisher, Subscriber
+from unittest.mock import patch
 
+import pytest
+
+from events.core.broker import Broker
+from events.core.components import Publisher, Subscriber, Transceiver
+from events.core.decorators import register, subscribes
+from events.core.event import Event
 
-class MockEvents(EventType):
-    TEST_EVENT = "test_event"
-    ANOTHER_EVENT = "another_event"
+from .conftest import MockEvents
 
 
 class MockPublisher(Publisher):
@@ -99,6 +99,17 @@ class TestBroker:
 
         assert "MockPublisher" in broker._components
 
+    def test_subscribe_many(self, counting_handler):
+        """Test subscribing one handler to several event types at once"""
+        broker = Broker(auto_discover=False)
+        handler = counting_handler
+
+        broker.subscribe_many([MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT], handler)
+
+        assert broker.get_subscriber_count(MockEvents.TEST_EVENT) == 1
+        assert broker.get_subscriber_count(MockEvents.ANOTHER_EVENT) == 1
+        assert broker._subscribers[MockEvents.TEST_EVENT] == [handler]
+
     def test_register_subscriber_with_pending_subscriptions(self):
         """Test subscriber with pending subscriptions gets registered"""
         broker = Broker(auto_discover=False)
@@ -124,6 +135,30 @@ class TestBroker:
 
         assert "broker not running" in caplog.text.lower()
 
+    @pytest.mark.asyncio
+    async def test_publish_when_queue_full_drops_event(self, first_warning):
+        """Test publishing into a full queue drops the event with a warning"""
+        broker = Broker(auto_discover=False, max_queue_size=2)
+        broker._running = True  # no processor task, so nothing drains the queue
+
+        for _ in range(3):
+            await broker.publish(Event(type=MockEvents.TEST_EVENT, source="test", payload={}))
+
+        assert broker.pending_events == 2
+        assert first_warning(f"Event queue full, dropping event: {MockEvents.TEST_EVENT}") is not None
+
+    @pytest.mark.asyncio
+    async def test_stop_drops_unprocessed_events(self, first_warning):
+        """Test stop discards events the processor never reached instead of waiting on them"""
+        broker = Broker(auto_discover=False)
+        broker._running = True
+        await broker.publish(Event(type=MockEvents.TEST_EVENT, source="test", payload={}))
+
+        await broker.stop()
+
+        assert broker.pending_events == 0
+        assert first_warning("Dropped 1 unprocessed events on stop") is not None
+
     @pytest.mark.asyncio
     async def test_start_already_running_logs_warning(self, caplog):
         """Test starting already running broker logs warning"""
@@ -160,6 +195,130 @@ class TestBroker:
         finally:
             await broker.stop()
 
+    @pytest.mark.asyncio
+    async def test_component_without_run_loop_gets_no_task(self):
+        """Test subscribers are started up and shut down without a task of their own"""
+        broker = Broker(auto_discover=False)
+
+        class LifecycleSubscriber(MockSubscriber):
+            async def startup(self):
+                self.subscribe_to(MockEvents.TEST_EVENT)
+
+            async def shutdown(self):
+                self.shut_down = True
+
+        subscriber = LifecycleSubscriber()
+        broker.register_component(subscriber, "sub")
+
+        await broker.start()
+
+        try:
+            assert "sub" not in broker._component_tasks
+            await broker._passive_startup_task
+            assert broker.get_subscriber_count(MockEvents.TEST_EVENT) == 1
+            assert broker.get_component_info("sub")["running"] is True
+        finally:
+            await broker.stop()
+
+        assert subscriber.shut_down is True
+        assert broker._passive_components == {}
+
+    @pytest.mark.asyncio
+    async def test_class_subscriptions_restored_after_stop_and_reregister(self):
+        """Test @subscribes handlers are subscribed again when a subscriber is re-registered after stop()"""
+        broker = Broker(auto_discover=False)
+        received = []
+
+        class DecoratedSubscriber(Subscriber):
+            @subscribes(MockEvents.TEST_EVENT)
+            async def handle_event(self, event):
+                received.append(event)
+
+        subscriber = DecoratedSubscriber()
+        broker.register_component(subscriber, "sub")
+        await broker.start()
+        await broker.stop()
+        assert broker._subscribers == {}
+
+        broker.register_component(subscriber, "sub")
+        assert broker.get_subscriber_count(MockEvents.TEST_EVENT) == 1
+        await broker.start()
+
+        try:
+            event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+            await broker.publish(event)
+            await broker.wait_idle()
+            assert received == [event]
+        finally:
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_passive_startup_leaves_others_running(self):
+        """Test one failing startup hook doesn't stop the others and its component is still shut down"""
+        broker = Broker(auto_discover=False)
+        shut_down = []
+
+        class LifecycleSubscriber(MockSubscriber):
+            fail = False
+
+            async def startup(self):
+                if self.fail:
+                    raise RuntimeError("startup failed")
+
+            async def shutdown(self):
+                shut_down.append(self.name)
+
+        failing = LifecycleSubscriber("failing")
+        failing.fail = True
+        broker.register_component(LifecycleSubscriber("first"), "first")
+        broker.register_component(failing, "failing")
+        broker.register_component(LifecycleSubscriber("second"), "second")
+
+        await broker.start()
+        await broker._passive_startup_task
+
+        assert set(broker._passive_components) == {"first", "second"}
+        assert broker.get_component_info("failing")["running"] is False
+        assert shut_down == ["failing"]  # right after its startup failed
+
+        await broker.stop()
+
+        assert sorted(shut_down) == ["failing", "first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_slow_passive_startup_does_not_block_start(self):
+        """Test start() returns before a slow startup hook finishes and stop() cancels it and shuts everything down"""
+        broker = Broker(auto_discover=False)
+        shut_down = []
+        release = asyncio.Event()
+
+        class LifecycleSubscriber(MockSubscriber):
+            slow = False
+
+            async def startup(self):
+                if self.slow:
+                    await release.wait()
+
+            async def shutdown(self):
+                shut_down.append(self.name)
+
+        slow = LifecycleSubscriber("slow")
+        slow.slow = True
+        broker.register_component(LifecycleSubscriber("fast"), "fast")
+        broker.register_component(slow, "slow")
+
+        await asyncio.wait_for(broker.start(), timeout=1.0)
+        await asyncio.sleep(0.01)
+
+        assert "fast" in broker._passive_components
+        assert "slow" not in broker._passive_components
+
+        # Stopping while the slow hook is still waiting cancels it, both components are shut down
+        await broker.stop()
+
+        assert sorted(shut_down) == ["fast", "slow"]
+        assert broker._passive_startup_task is None
+
     @pytest.mark.asyncio
     async def test_start_with_state_machine_component(self):
         """Test starting broker with state machine component"""
@@ -175,12 +334,12 @@ class TestBroker:
             await broker.stop()
 
     @pytest.mark.asyncio
-    async def test_stop_cleans_up_properly(self):
+    async def test_stop_cleans_up_properly(self, counting_handler):
         """Test that stop cleans up all resources"""
         broker = Broker(auto_discover=False)
         component = MockPublisher()
         broker.register_component(component, "test_pub")
-        broker.subscribe(MockEvents.TEST_EVENT, Mock())
+        broker.subscribe(MockEvents.TEST_EVENT, counting_handler)
 
         await broker.start()
         assert broker._running is True
@@ -194,6 +353,30 @@ class TestBroker:
         assert len(broker._subscribers) == 0
         assert len(broker._component_tasks) == 0
 
+    @pytest.mark.asyncio
+    async def test_stop_failure_does_not_block_other_components(self, caplog):
+        """Test one state machine failing to stop is logged and the others still stop"""
+        broker = Broker(auto_discover=False)
+
+        class FailingStopStateMachine(MockStateMachine):
+            async def stop(self):
+                raise RuntimeError("Stop failed")
+
+        healthy = MockStateMachine()
+        publisher = MockPublisher()
+        broker.register_component(FailingStopStateMachine(), "failing")
+        broker.register_component(healthy, "healthy")
+        broker.register_component(publisher, "pub")
+
+        await broker.start()
+        run_task = broker._component_tasks["pub"]
+        await broker.stop()
+
+        assert "Error stopping state machine for failing: Stop failed" in caplog.text
+        assert healthy._state_machine_running is False
+        assert run_task.done()
+        assert broker._event_processor_task.done()
+
     @pytest.mark.asyncio
     async def test_component_startup_failure_handling(self, caplog):
         """Test handling of component startup failures"""
@@ -281,6 +464,36 @@ class TestBroker:
         assert info["type"] == "Publisher"
         assert info["running"] is False
 
+    @pytest.mark.parametrize("component_class, category", [
+        (MockPublisher, "Publisher"),
+        (MockSubscriber, "Subscriber"),
+        (Transceiver, "Transceiver"),
+        (MockStateMachine, "Component"),
+    ])
+    def test_get_component_info_type(self, component_class, category):
+        """Test component info reports the component's category"""
+        broker = Broker(auto_discover=False)
+        broker.register_component(component_class(), None)
+
+        info = broker.get_component_info(component_class.__name__)
+
+        assert info["class"] == component_class.__name__
+        assert info["type"] == category
+
+    def test_component_slot_flags(self):
+        """Test registration resolves each component's capabilities once"""
+        broker = Broker(auto_discover=False)
+        broker.register_component(MockPublisher(), "pub")
+        broker.register_component(MockSubscriber(), "sub")
+        broker.register_component(MockStateMachine(), "sm")
+
+        pub, sub, sm = (broker._components[component_id] for component_id in ("pub", "sub", "sm"))
+
+        assert (pub.type_name, pub.is_publisher, pub.is_subscriber, pub.has_run) == ("MockPublisher", True, False, True)
+        assert (sub.is_publisher, sub.is_subscriber, sub.is_state_machine) == (False, True, False)
+        assert (sm.is_state_machine, sm.has_stop, sm.has_run) == (True, True, False)
+        assert broker._state_machine_slots == [sm]
+
     def test_get_component_info_nonexistent(self):
         """Test getting info for non-existent component returns None"""
         broker = Broker(auto_discover=False)
@@ -289,7 +502,7 @@ class TestBroker:
 
         assert info is None
 
-    def test_utility_methods(self):
+    def test_utility_methods(self, counting_handler):
         """Test broker utility methods"""
         broker = Broker(auto_discover=False)
 
@@ -302,60 +515,71 @@ class TestBroker:
         # Add components and subscribers
         broker.register_component(MockPublisher(), "pub1")
         broker.register_component(MockSubscriber(), "sub1")
-        broker.subscribe(MockEvents.TEST_EVENT, Mock())
-        broker.subscribe(MockEvents.TEST_EVENT, Mock())
+        broker.subscribe(MockEvents.TEST_EVENT, counting_handler)
+        broker.subscribe(MockEvents.TEST_EVENT, counting_handler)
 
         assert set(broker.list_components()) == {"pub1", "sub1"}
         assert MockEvents.TEST_EVENT in broker.list_event_types()
         assert broker.get_subscriber_count(MockEvents.TEST_EVENT) == 2
 
-    @patch('events.core.broker.component_registry')
-    def test_auto_discover_disabled(self, mock_registry):
+    @patch('events.core.broker.get_component_registry')
+    def test_auto_discover_disabled(self, mock_get_registry):
         """Test that auto-discovery is disabled when configured"""
+        mock_registry = mock_get_registry.return_value
         broker = Broker(auto_discover=False)
 
         broker._auto_discover_components()
 
-        mock_registry.get_all_registrations.assert_not_called()
+        mock_registry.get_auto_start_registrations.assert_not_called()
 
-    @patch('events.core.broker.component_registry')
-    def test_auto_discover_enabled(self, mock_registry):
+    @patch('events.core.broker.get_component_registry')
+    def test_auto_discover_enabled(self, mock_get_registry):
         """Test auto-discovery when enabled"""
+        mock_registry = mock_get_registry.return_value
         mock_registration = {
-            'class': MockPublisher,
+            'class_': MockPublisher,
             'constructor_kwargs': {'name': 'auto_pub'},
-            'auto_start': True,
             'component_id': 'auto_publisher'
         }
 
-        mock_registry.get_all_registrations.return_value = {
-            'publishers': [mock_registration],
-            'subscribers': [],
-            'transceivers': []
-        }
+        mock_registry.get_auto_start_registrations.return_value = [mock_registration]
 
         broker = Broker(auto_discover=True)
         # Test the auto-discovery path in start()
         broker._auto_discover_components()
 
-        mock_registry.get_all_registrations.assert_called_once()
+        mock_registry.get_auto_start_registrations.assert_called_once()
+        assert broker._components['auto_publisher'].component.name == 'auto_pub'
+
+    def test_auto_discover_registered_components(self):
+        """Test auto-discovery instantiates components registered through the decorators"""
+        @register(name="decorated")
+        class DecoratedPublisher(MockPublisher):
+            pass
+
+        @register(auto_start=False)
+        class ManualSubscriber(MockSubscriber):
+            pass
+
+        broker = Broker(auto_discover=True)
+        broker._auto_discover_components()
+
+        assert broker.list_components() == ["DecoratedPublisher"]
+        assert broker._components["DecoratedPublisher"].component.name == "decorated"
 
     @pytest.mark.asyncio
     async def test_auto_discover_called_on_start(self):
         """Test that auto-discovery is called during start when enabled"""
-        with patch('events.core.broker.component_registry') as mock_registry:
-            mock_registry.get_all_registrations.return_value = {
-                'publishers': [],
-                'subscribers': [],
-                'transceivers': []
-            }
+        with patch('events.core.broker.get_component_registry') as mock_get_registry:
+            mock_registry = mock_get_registry.return_value
+            mock_registry.get_auto_start_registrations.return_value = []
 
             broker = Broker(auto_discover=True)  # Default is True
             await broker.start()
 
             try:
                 # Should have called auto-discovery
-                mock_registry.get_all_registrations.assert_called_once()
+                mock_registry.get_auto_start_registrations.assert_called_once()
             finally:
                 await broker.stop()
 
@@ -377,10 +601,7 @@ class TestBroker:
             await broker.publish(event)
 
             # Wait for event processing
-            for _ in range(20):  # 2 second timeout
-                await asyncio.sleep(0.1)
-                if len(subscriber.received_events) > 0:
-                    break
+            await broker.wait_idle()
 
             # Verify event was delivered
             assert len(subscriber.received_events) == 1
@@ -390,10 +611,10 @@ class TestBroker:
             await broker.stop()
 
     @pytest.mark.asyncio
-    async def test_sync_handler_execution(self):
+    async def test_sync_handler_execution(self, counting_handler):
         """Test that synchronous handlers are executed correctly"""
         broker = Broker(auto_discover=False)
-        sync_handler = Mock()
+        sync_handler = counting_handler
 
         broker.subscribe(MockEvents.TEST_EVENT, sync_handler)
         await broker.start()
@@ -403,12 +624,10 @@ class TestBroker:
             await broker.publish(event)
 
             # Wait for event processing
-            for _ in range(20):
-                await asyncio.sleep(0.1)
-                if sync_handler.called:
-                    break
+            await broker.wait_idle()
 
-            sync_handler.assert_called_once_with(event)
+            assert sync_handler.calls == 1
+            assert sync_handler.last is event
         finally:
             await broker.stop()
 
@@ -428,13 +647,125 @@ class TestBroker:
             await broker.publish(event)
 
             # Wait for event processing
-            await asyncio.sleep(0.2)
+            await broker.wait_idle()
 
             assert f"Handler error for event {MockEvents.TEST_EVENT}" in caplog.text
             assert "Handler failed" in caplog.text
         finally:
             await broker.stop()
 
+    @pytest.mark.asyncio
+    async def test_event_burst_delivered_in_publish_order(self):
+        """Test a burst of mixed event types is dispatched in the order it was published"""
+        broker = Broker(auto_discover=False)
+        received = []
+        broker.subscribe_many([MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT], received.append)
+        await broker.start()
+
+        try:
+            types = [MockEvents.TEST_EVENT, MockEvents.TEST_EVENT, MockEvents.ANOTHER_EVENT, MockEvents.TEST_EVENT]
+            for i, event_type in enumerate(types):
+                await broker.publish(Event(type=event_type, source="test", payload={"seq": i}))
+
+            await broker.wait_idle()
+
+            assert [event.payload["seq"] for event in received] == [0, 1, 2, 3]
+            assert [event.type for event in received] == types
+        finally:
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_async_handler_exception_does_not_block_others(self, caplog, counting_handler):
+        """Test a failing async handler is logged while the other handlers still run"""
+        broker = Broker(auto_discover=False)
+        received = []
+
+        async def failing_handler(event):
+            raise ValueError("Async handler failed")
+
+        async def recording_handler(event):
+            received.append(event)
+
+        sync_handler = counting_handler
+        broker.subscribe(MockEvents.TEST_EVENT, failing_handler)
+        broker.subscribe(MockEvents.TEST_EVENT, recording_handler)
+        broker.subscribe(MockEvents.TEST_EVENT, sync_handler)
+        await broker.start()
+
+        try:
+            event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+            await broker.publish(event)
+
+            await broker.wait_idle()
+
+            assert received == [event]
+            assert sync_handler.calls == 1
+            assert sync_handler.last is event
+            assert "Async handler failed" in caplog.text
+            assert broker._subscribers[MockEvents.TEST_EVENT] == [failing_handler, recording_handler, sync_handler]
+        finally:
+            await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_split_follows_subscribers(self, counting_handler):
+        """Test the sync/async split is derived from _subscribers and rebuilt when a handler subscribes later"""
+        broker = Broker(auto_discover=False)
+        received = []
+
+        async def async_handler(event):
+            received.append(event)
+
+        broker.subscribe(MockEvents.TEST_EVENT, async_handler)
+        await broker.start()
+
+        try:
+            first = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+            await broker.publish(first)
+            await broker.wait_idle()
+            assert broker._dispatch_tables[MockEvents.TEST_EVENT] == ((), (async_handler,))
+
+            # Subscribing after the split was built drops it, the next dispatch sees both handlers
+            broker.subscribe_many([MockEvents.TEST_EVENT], counting_handler)
+            assert MockEvents.TEST_EVENT not in broker._dispatch_tables
+
+            second = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+            await broker.publish(second)
+            await broker.wait_idle()
+
+            assert received == [first, second]
+            assert counting_handler.calls == 1
+            assert counting_handler.last is second
+            assert broker._dispatch_tables[MockEvents.TEST_EVENT] == ((counting_handler,), (async_handler,))
+        finally:
+            await broker.stop()
+
+        assert broker._dispatch_tables == {}
+
+    @pytest.mark.asyncio
+    async def test_wait_idle(self, counting_handler):
+        """Test wait_idle returns once published events are dispatched and times out while they aren't"""
+        broker = Broker(auto_discover=False)
+        await broker.wait_idle()  # nothing published yet
+
+        broker._running = True  # no processor task, the event stays queued
+        await broker.publish(Event(type=MockEvents.TEST_EVENT, source="test", payload={}))
+        with pytest.raises(asyncio.TimeoutError):
+            await broker.wait_idle(timeout=0.01)
+        broker._running = False
+
+        handler = counting_handler
+        broker.subscribe(MockEvents.TEST_EVENT, handler)
+        await broker.start()
+
+        try:
+            await broker.publish(Event(type=MockEvents.TEST_EVENT, source="test", payload={}))
+            await broker.wait_idle()
+
+            assert handler.calls == 2
+            assert broker.pending_events == 0
+        finally:
+            await broker.stop()
+
     @pytest.mark.asyncio
     async def test_no_subscribers_logging(self, caplog):
         """Test logging when no subscribers exist for event"""
@@ -449,7 +780,7 @@ class TestBroker:
                 await broker.publish(event)
 
                 # Wait for event processing
-                await asyncio.sleep(0.2)
+                await broker.wait_idle()
 
             assert f"No subscribers for event type: {MockEvents.ANOTHER_EVENT}" in caplog.text
         finally:
@@ -1,6 +1,8 @@
-import pytest
 import asyncio
 from unittest.mock import Mock
+
+import pytest
+
 from events import state
 
 
@@ -47,9 +49,10 @@ class TestStateDecorator:
         async def test_method(self, event=None):
             return None
 
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         result = await test_method(mock_self)
-        end_time = asyncio.get_event_loop().time()
+        end_time = loop.time()
 
         assert result is None
         assert end_time - start_time >= 0.01  # Should have slept
@@ -64,9 +67,10 @@ class TestStateDecorator:
         async def test_method(self, event=None):
             return "idle"  # Same as current state
 
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         result = await test_method(mock_self)
-        end_time = asyncio.get_event_loop().time()
+        end_time = loop.time()
 
         assert result == "idle"
         assert end_time - start_time >= 0.01  # Should have slept
@@ -81,9 +85,10 @@ class TestStateDecorator:
         async def test_method(self, event=None):
             return "active"  # Different from current state
 
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         result = await test_method(mock_self)
-        end_time = asyncio.get_event_loop().time()
+        end_time = loop.time()
 
         assert result == "active"
         # Should not poll since it's transitioning
@@ -99,9 +104,10 @@ class TestStateDecorator:
         async def test_method(self, event=None):
             return None
 
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
         await test_method(mock_self)
-        end_time = asyncio.get_event_loop().time()
+        end_time = loop.time()
 
         # Should use runtime interval (0.02) not default (0.1)
         assert 0.02 <= end_time - start_time < 0.05
@@ -119,6 +125,31 @@ class TestStateDecorator:
         result = await test_method(mock_self, mock_event)
         assert result is mock_event
 
+    def test_accepts_event_read_once_from_signature(self):
+        """Test the decorator records whether the state method takes the event"""
+
+        @state("with_event")
+        async def with_event(self, event=None):
+            return None
+
+        @state("without_event")
+        async def without_event(self):
+            return None
+
+        @state("varargs")
+        async def varargs(self, *args):
+            return None
+
+        @state("batch")
+        async def batch(self, events):
+            return None
+
+        assert with_event._accepts_event is True
+        assert without_event._accepts_event is False
+        assert varargs._accepts_event is True
+        assert batch._accepts_events is True
+        assert with_event._accepts_events is False
+
     @pytest.mark.asyncio
     async def test_exception_propagation(self):
         """Test that exceptions in state methods are propagated"""
@@ -166,3 +197,5 @@ class TestStateDecorator:
         assert instance.method1._default_poll_interval == 0.1
         assert instance.method2._state_name == "state2"
         assert instance.method2._default_poll_interval == 0.2
+        assert instance.method1.__name__ == "method1"
+        assert not hasattr(TestClass.method1, "__wrapped__")
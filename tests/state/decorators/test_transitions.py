@@ -1,3 +1,5 @@
+import pytest
+
 from events import transitions
 
 
@@ -55,3 +57,25 @@ class TestTransitionsDecorator:
         # Should be class attribute, not instance attribute
         assert '_transition_map' not in instance.__dict__
         assert TestClass._transition_map == {"a": {"b"}}
+
+    def test_compiles_transition_bitmasks(self):
+        @transitions({"idle": ["active"], "active": ["idle", "error"]})
+        class TestClass:
+            pass
+
+        transition_map, state_ids, masks = TestClass._compiled_transitions
+
+        assert transition_map is TestClass._transition_map
+        assert state_ids == {"active": 0, "error": 1, "idle": 2}
+        assert masks == (0b110, 0b000, 0b001)
+
+    def test_transition_map_is_read_only(self):
+        @transitions({"idle": ["active"]})
+        class TestClass:
+            pass
+
+        # The compiled masks stay valid because the map they came from can't change
+        with pytest.raises(TypeError):
+            TestClass._transition_map["idle"] = frozenset({"error"})
+        with pytest.raises(AttributeError):
+            TestClass._transition_map["idle"].add("error")
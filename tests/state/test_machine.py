@@ -1,11 +1,14 @@
-import pytest
 import asyncio
+import gc
 import time
-from unittest.mock import Mock
+import weakref
+from contextlib import suppress
+from types import SimpleNamespace
 
+import pytest
 import pytest_asyncio
 
-from events import StateMachine, Event, EventType, initial_state, state
+from events import Event, EventType, StateMachine, Subscriber, initial_state, state, transitions
 
 
 class MockEvents(EventType):
@@ -13,18 +16,20 @@ class MockEvents(EventType):
     TEST_EVENT = "test_event"
 
 
+def _stub(**attrs):
+    """Placeholder handler, far cheaper than a Mock when nothing is called or asserted on it"""
+    return SimpleNamespace(**attrs)
+
+
 @pytest_asyncio.fixture
 async def cleanup_tasks():
-    """Cleanup any remaining asyncio tasks after each test"""
+    """Cleanup any state machine tasks still running after each test"""
     yield
-    # Cancel any remaining tasks
-    tasks = [t for t in asyncio.all_tasks() if not t.done()]
-    for task in tasks:
+    # Only tasks the state machines spawned, not every task on the loop
+    for task in StateMachine._all_owned_tasks():
         task.cancel()
-        try:
+        with suppress(TimeoutError, asyncio.CancelledError):
             await asyncio.wait_for(task, timeout=1.0)
-        except (asyncio.CancelledError, asyncio.TimeoutError):
-            pass
 
 
 class TestStateMachine:
@@ -69,6 +74,43 @@ class TestStateMachine:
         assert sm._is_valid_transition("idle", "unknown") is False
         assert sm._is_valid_transition("active", "error") is False
 
+    def test_subclass_transition_map_overrides_compiled_parent(self):
+        """Test a subclass assigning its own map doesn't reuse the parent's compiled masks"""
+
+        @transitions({"idle": ["active"]})
+        class ParentSM(StateMachine):
+            pass
+
+        class ChildSM(ParentSM):
+            _transition_map = {"idle": {"error"}}
+
+        parent, child = ParentSM(), ChildSM()
+
+        assert parent._is_valid_transition("idle", "active") is True
+        assert parent._is_valid_transition("idle", "error") is False
+        assert child._is_valid_transition("idle", "error") is True
+        assert child._is_valid_transition("idle", "active") is False
+
+    def test_transition_map_changed_on_instance(self):
+        """Test replacing or editing an instance's transition map takes effect on the next check"""
+
+        @transitions({"idle": ["active"]})
+        class TestSM(StateMachine):
+            pass
+
+        sm = TestSM()
+        assert sm._is_valid_transition("idle", "error") is False
+
+        sm._transition_map = {"idle": {"error"}}
+        assert sm._is_valid_transition("idle", "error") is True
+        assert sm._is_valid_transition("idle", "active") is False
+
+        sm._transition_map["idle"].add("active")
+        sm._transition_map["error"] = {"idle"}
+        assert sm._is_valid_transition("idle", "active") is True
+        assert sm._is_valid_transition("error", "idle") is True
+        assert TestSM()._is_valid_transition("idle", "error") is False  # class map untouched
+
     @pytest.mark.asyncio
     async def test_transition_to_unknown_state(self, caplog):
         """Test transitioning to non-existent state"""
@@ -88,7 +130,7 @@ class TestStateMachine:
 
         sm = TestSM()
         sm._current_state = "idle"
-        sm._state_handlers = {"idle": Mock(), "error": Mock()}
+        sm._state_handlers = {"idle": _stub(), "error": _stub()}
 
         result = await sm.transition_to("error")
 
@@ -99,7 +141,7 @@ class TestStateMachine:
     async def test_successful_transition(self):
         """Test successful state transition"""
         sm = StateMachine()
-        sm._state_handlers = {"active": Mock()}
+        sm._state_handlers = {"active": _stub()}
 
         result = await sm.transition_to("active")
 
@@ -107,6 +149,8 @@ class TestStateMachine:
         assert sm._current_state == "active"
         assert sm._previous_state is None
         assert sm._state_start_time > 0
+        assert isinstance(sm._state_start_time_ns, int)
+        assert sm._state_start_time == pytest.approx(sm._state_start_time_ns * 1e-9)
 
     @pytest.mark.asyncio
     async def test_state_change_event_publishing(self):
@@ -121,7 +165,7 @@ class TestStateMachine:
                 published_events.append(event)
 
         sm = TestSM()
-        sm._state_handlers = {"active": Mock()}
+        sm._state_handlers = {"active": _stub()}
 
         await sm.transition_to("active")
 
@@ -131,6 +175,32 @@ class TestStateMachine:
         assert event.payload["current_state"] == "active"
         assert event.payload["previous_state"] is None
 
+    @pytest.mark.asyncio
+    async def test_state_change_events_are_independent(self):
+        """Test each transition publishes its own event, so queued events keep their own payload"""
+        published = []
+
+        class TestSM(StateMachine):
+            def __init__(self):
+                super().__init__(state_change_event_type=MockEvents.STATE_CHANGED)
+
+            async def publish(self, event):
+                published.append(event)
+
+        sm = TestSM()
+        sm._state_handlers = {"idle": _stub(), "active": _stub()}
+
+        await sm.transition_to("idle")
+        await sm.transition_to("active")
+
+        first, second = published
+        assert first is not second
+        assert first.payload["previous_state"] is None
+        assert first.payload["current_state"] == "idle"
+        assert second.payload["previous_state"] == "idle"
+        assert second.payload["current_state"] == "active"
+        assert second.source == "TestSM"
+
     @pytest.mark.asyncio
     async def test_start_no_initial_state(self, caplog):
         """Test starting without initial state"""
@@ -155,7 +225,7 @@ class TestStateMachine:
         sm = TestSM()
 
         try:
-            await asyncio.wait_for(sm.start(), timeout=2.0)
+            await sm.start()
             await asyncio.sleep(0.05)  # Let it start
 
             assert sm.is_running is True
@@ -167,6 +237,29 @@ class TestStateMachine:
             if sm.is_running:
                 await sm.stop()
 
+    def test_run_standalone_uses_loop_factory(self):
+        """Test run_standalone drives the machine to completion on a loop from loop_factory"""
+        loops = []
+
+        def loop_factory():
+            loops.append(asyncio.new_event_loop())
+            return loops[-1]
+
+        @initial_state("working")
+        class TestSM(StateMachine):
+            @state("working")
+            async def working_state(self):
+                self.loop = asyncio.get_running_loop()
+                return False
+
+        sm = TestSM(loop_factory=loop_factory)
+        sm.run_standalone()
+
+        assert len(loops) == 1
+        assert sm.loop is loops[0]
+        assert loops[0].is_closed()
+        assert sm.is_running is False
+
     @pytest.mark.asyncio
     async def test_restart_resets_error_count(self, cleanup_tasks):
         """Test that restart resets consecutive error count"""
@@ -181,7 +274,7 @@ class TestStateMachine:
         sm._consecutive_errors = 3
 
         try:
-            await asyncio.wait_for(sm.restart(), timeout=2.0)
+            await sm.restart()
             assert sm._consecutive_errors == 0
         finally:
             await sm.stop()
@@ -241,6 +334,48 @@ class TestStateMachine:
         assert sm.error_state_called is True
         assert sm.test_calls == 2  # Should have tried twice
 
+    @pytest.mark.asyncio
+    async def test_error_state_added_while_running(self):
+        """Test an error state added after the loop started is still used to recover"""
+        calls = []
+
+        async def failing():
+            calls.append("failing")
+            if len(calls) == 1:
+                sm._state_handlers["error"] = error
+                raise RuntimeError("Test error")
+            return False
+
+        async def error():
+            calls.append("error")
+            return "failing"
+
+        sm = StateMachine()
+        sm._state_handlers = {"failing": failing}
+        await sm.transition_to("failing")
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert calls == ["failing", "error", "failing"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_current_state_goes_to_error_state(self, caplog):
+        """Test a current state without a handler is handled like a failed tick, without raising"""
+        error_calls = []
+
+        async def error_state():
+            error_calls.append(sm._consecutive_errors)
+            return False
+
+        sm = StateMachine()
+        sm._current_state = "missing"
+        sm._state_handlers = {"error": error_state}
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert error_calls == [1]
+        assert "State machine error in missing: no handler for state missing" in caplog.text
+
     def test_poll_interval_management(self):
         """Test setting and getting poll intervals"""
         sm = StateMachine()
@@ -256,46 +391,185 @@ class TestStateMachine:
         """Test getting poll interval from decorated method"""
         sm = StateMachine()
 
-        # Mock a handler with default poll interval
-        handler = Mock()
-        handler._default_poll_interval = 0.7
+        # Stub a handler with default poll interval
+        handler = _stub(_default_poll_interval=0.7)
         sm._state_handlers = {"test_state": handler}
 
         assert sm.get_poll_interval("test_state") == 0.7
 
+    def test_poll_interval_reads_live_attribute(self):
+        """Test get_poll_interval follows the attribute the @state wrapper sleeps on, however it was set"""
+
+        class TestSM(StateMachine):
+            @state("idle", poll_interval=0.3)
+            async def idle_state(self):
+                return None
+
+        sm = TestSM()
+        assert sm.get_poll_interval("idle") == 0.3
+
+        sm.set_poll_interval("idle", 0.05)
+        assert sm.get_poll_interval("idle") == 0.05
+        assert sm._idle_poll_interval == 0.05  # what the @state wrapper reads
+
+        sm._idle_poll_interval = 0.7
+        assert sm.get_poll_interval("idle") == 0.7
+
     def test_properties(self):
         """Test state machine properties"""
         sm = StateMachine()
         sm._current_state = "test_state"
         sm._previous_state = "old_state"
         sm._state_start_time = time.monotonic() - 1.0
-        sm._state_handlers = {"test": Mock(), "another": Mock()}
+        sm._state_handlers = {"test": _stub(), "another": _stub()}
 
         assert sm.current_state == "test_state"
         assert sm.previous_state == "old_state"
         assert sm.state_uptime >= 1.0
         assert sm.available_states == {"test", "another"}
+        assert sm.available_states is sm.available_states  # built once, not per read
+        assert isinstance(sm.available_states, frozenset)
+
+        # Edited in place, the cached set is rebuilt to match the live handlers
+        sm._state_handlers["extra"] = _stub()
+        assert sm.available_states == {"test", "another", "extra"}
+        del sm._state_handlers["test"]
+        assert sm.available_states == {"another", "extra"}
+
+    @pytest.mark.asyncio
+    async def test_handlers_indexed_by_state_id(self):
+        """Test the run loop dispatches through the handler list, falling back to the name for unnumbered states"""
+        calls = []
+
+        async def first():
+            calls.append("first")
+            return "second"
+
+        async def second():
+            calls.append("second")
+            return False
+
+        sm = StateMachine()
+        sm._current_state = "first"
+        assert sm._current_state_id is None  # not a known state yet
+
+        sm._state_handlers = {"first": first, "second": second}
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert calls == ["first", "second"]
+        assert sm._handlers_by_id == [first, second]
+        assert sm._current_state == "second"
+        assert sm._current_state_id == 1
+
+    @pytest.mark.asyncio
+    async def test_handler_added_while_running_gets_its_own_event_mode(self):
+        """Test a state added after the loop indexed its handlers is called by its own signature, not with the event"""
+        calls = []
+        event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+
+        async def no_event():
+            calls.append("no_event")
+            return "with_event"
+
+        async def with_event(event):
+            calls.append(event)
+            return False
+
+        async def first():
+            sm._state_handlers["no_event"] = no_event
+            sm._state_handlers["with_event"] = with_event
+            sm._pending_events.append(event)
+            return "no_event"
+
+        sm = StateMachine()
+        sm._state_handlers = {"first": first}
+        await sm.transition_to("first")
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert calls == ["no_event", event]
+        assert sm._consecutive_errors == 0
+        assert not sm._pending_events
+
+    def test_discovered_handlers_hold_no_reference_to_instance(self):
+        """Test discovered states are stored unbound, so a machine is freed without the cycle collector"""
+
+        class TestSM(StateMachine):
+            @state("idle")
+            async def idle_state(self):
+                return None
+
+        class SubscriberSM(Subscriber, TestSM):
+            def __init__(self):
+                Subscriber.__init__(self)
+                TestSM.__init__(self)
+
+        for machine_class in (TestSM, SubscriberSM):
+            sm = machine_class()
+            assert sm._state_handlers == {"idle": TestSM.idle_state}
+
+            ref = weakref.ref(sm)
+            gc.disable()
+            try:
+                del sm
+                assert ref() is None, machine_class.__name__
+            finally:
+                gc.enable()
 
     def test_state_uptime_no_current_state(self):
         """Test uptime when no current state"""
         sm = StateMachine()
         assert sm.state_uptime == 0.0
 
-    def test_is_running_property(self):
+    @pytest.mark.asyncio
+    async def test_is_running_property(self, cleanup_tasks):
         """Test is_running property logic"""
-        sm = StateMachine()
+
+        @initial_state("idle")
+        class TestSM(StateMachine):
+            @state("idle", poll_interval=0.01)
+            async def idle_state(self):
+                return None
+
+        sm = TestSM()
 
         # Not running initially
         assert sm.is_running is False
 
-        # Mock running state
-        sm._state_machine_running = True
-        sm._state_task = Mock()
-        sm._state_task.done.return_value = False
+        # Running as soon as the loop task exists
+        await sm.start()
         assert sm.is_running is True
 
-        # Task done
-        sm._state_task.done.return_value = True
+        # Task ending by any means clears it through the done callback, without stop()
+        sm._state_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await sm._state_task
+        assert sm.is_running is False
+
+    @pytest.mark.asyncio
+    async def test_is_running_cleared_when_loop_awaited_directly(self):
+        """Test the loop clears is_running on its way out when no task and done callback are involved"""
+        seen = []
+
+        async def active():
+            seen.append(sm.is_running)
+            return False
+
+        async def failing():
+            raise RuntimeError("state failed")
+
+        sm = StateMachine()
+        sm._state_handlers = {"active": active}
+        await sm.transition_to("active")
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+        assert seen == [True]
+        assert sm.is_running is False
+
+        # Same when the loop gives up after an error with no error state to go to
+        sm._state_handlers = {"failing": failing}
+        await sm.transition_to("failing")
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
         assert sm.is_running is False
 
     @pytest.mark.asyncio
@@ -321,7 +595,7 @@ class TestStateMachine:
         sm = RealSM()
 
         try:
-            await asyncio.wait_for(sm.start(), timeout=2.0)
+            await sm.start()
             await asyncio.sleep(0.1)  # Let it run
 
             assert "start" in sm.states_visited
@@ -352,11 +626,86 @@ class TestStateMachine:
 
         event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
 
-        await sm._state_aware_handle_event(event)
+        await sm.handle_event(event)
 
         assert sm._current_event == event
         assert len(sm.received_events) == 1
 
+    @pytest.mark.asyncio
+    async def test_state_aware_handler_replaces_cached_subscriber_handler(self):
+        """Test subscriptions made after both inits go through the state-aware handler"""
+
+        class SubscriberSM(Subscriber, StateMachine):
+            def __init__(self):
+                Subscriber.__init__(self)
+                StateMachine.__init__(self)
+
+            async def handle_event(self, event):
+                pass
+
+        sm = SubscriberSM()
+        event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+
+        assert sm._handle_event_bound is None  # not cached on machines, it would be a self-reference
+        await sm._event_handler(event)
+
+        assert sm._current_event == event
+        assert "handle_event" not in vars(sm)  # wrapped on the class, not per instance
+
+    @pytest.mark.asyncio
+    async def test_handle_event_wrapped_once_per_class(self):
+        """Test every subclass override is wrapped, and super() chains call each original once"""
+        received = []
+
+        class BaseSM(StateMachine):
+            async def handle_event(self, event):
+                received.append("base")
+
+        class ChildSM(BaseSM):
+            async def handle_event(self, event):
+                received.append("child")
+                await super().handle_event(event)
+
+        class PlainChildSM(BaseSM):
+            pass
+
+        sm = ChildSM()
+        event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+
+        await sm.handle_event(event)
+
+        assert received == ["child", "base"]
+        assert sm._current_event == event
+        assert PlainChildSM.handle_event is BaseSM.handle_event
+        assert ChildSM._original_handle_event.__qualname__.endswith("ChildSM.handle_event")
+        assert not hasattr(StateMachine(), "_original_handle_event")
+
+    @pytest.mark.asyncio
+    async def test_super_handle_event_chain_queues_event_once(self):
+        """Test an override calling super().handle_event() through two levels still queues each event once"""
+
+        class BaseSM(StateMachine):
+            async def handle_event(self, event):
+                await asyncio.sleep(0)
+
+        class MiddleSM(BaseSM):
+            async def handle_event(self, event):
+                await super().handle_event(event)
+
+        class ChildSM(MiddleSM):
+            async def handle_event(self, event):
+                await super().handle_event(event)
+
+        child, middle = ChildSM(), MiddleSM()
+        first, second = (Event(type=MockEvents.TEST_EVENT, source="test", payload={"n": n}) for n in range(2))
+
+        # Dispatched concurrently, the way the broker gathers async handlers
+        await asyncio.gather(child.handle_event(first), child.handle_event(second))
+        await middle.handle_event(first)
+
+        assert list(child._pending_events) == [first, second]
+        assert list(middle._pending_events) == [first]
+
     @pytest.mark.asyncio
     async def test_state_handler_with_event(self):
         """Test state handler receiving current event"""
@@ -383,6 +732,93 @@ class TestStateMachine:
         # Should have received the event and cleared it
         assert sm.received_event == test_event
         assert sm._current_event is None
+        assert sm._has_event is False
+
+    @pytest.mark.asyncio
+    async def test_state_handler_without_event_parameter(self):
+        """Test a pending event doesn't break a state that takes no event, it waits for one that does"""
+
+        class TestSM(StateMachine):
+            @state("waiting", poll_interval=0.01)
+            async def waiting_state(self):
+                return "consuming"
+
+            @state("consuming", poll_interval=0.01)
+            async def consuming_state(self, event=None):
+                self.received_event = event
+                return False
+
+        sm = TestSM()
+        sm._current_state = "waiting"
+        test_event = Event(type=MockEvents.TEST_EVENT, source="test", payload={})
+        sm._current_event = test_event
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert dict(zip(sm._state_handlers, sm._event_modes_by_id, strict=True)) == {"waiting": 0, "consuming": 1}
+        assert sm._consecutive_errors == 0
+        assert sm.received_event == test_event
+        assert sm._current_event is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("batched", [True, False])
+    async def test_pending_events_batched_per_tick(self, batched):
+        """Test an events handler gets every pending event in order, an event handler only the latest"""
+        received = []
+
+        class TestSM(StateMachine):
+            async def handle_event(self, event):
+                pass
+
+            @state("batch")
+            async def batch_state(self, events):
+                received.append([event.payload["n"] for event in events])
+                return False
+
+            @state("single")
+            async def single_state(self, event=None):
+                received.append(event.payload["n"])
+                return False
+
+        sm = TestSM(max_pending_events=3)
+        sm._current_state = "batch" if batched else "single"
+        for n in range(5):
+            await sm.handle_event(Event(type=MockEvents.TEST_EVENT, source="test", payload={"n": n}))
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert received == ([[2, 3, 4]] if batched else [4])  # oldest dropped past max_pending_events
+        assert sm._has_event is False
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_requeued_dropping_oldest_when_full(self):
+        """Test a batch given back after its handler raises goes ahead of newer events, and overflow drops the oldest"""
+        received = []
+
+        class TestSM(StateMachine):
+            async def handle_event(self, event):
+                pass
+
+            @state("batch")
+            async def batch_state(self, events):
+                # Two more arrive while this batch is being handled, then it fails
+                for n in (3, 4):
+                    await self.handle_event(Event(type=MockEvents.TEST_EVENT, source="test", payload={"n": n}))
+                raise RuntimeError("batch failed")
+
+            @state("error")
+            async def error_state(self, events):
+                received.append([event.payload["n"] for event in events])
+                return False
+
+        sm = TestSM(max_pending_events=3)
+        sm._current_state = "batch"
+        for n in range(3):
+            await sm.handle_event(Event(type=MockEvents.TEST_EVENT, source="test", payload={"n": n}))
+
+        await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
+
+        assert received == [[2, 3, 4]]
 
     @pytest.mark.asyncio
     async def test_max_consecutive_errors_reached(self, caplog):
@@ -410,6 +846,7 @@ class TestStateMachine:
 
         await asyncio.wait_for(sm._run_state_machine(), timeout=2.0)
 
-        # Should have hit the consecutive error limit
-        assert sm._consecutive_errors >= 2
+        # Should have hit the consecutive error limit, and counting stops right there
+        assert sm._consecutive_errors == 2
+        assert sm.error_count == 1  # failing once, then the error state failing too
         assert "Too many consecutive errors, stopping state machine" in caplog.text